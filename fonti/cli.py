@@ -1,8 +1,7 @@
 import logging
 from pathlib import Path
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List, Tuple
 
-import httpx
 import typer
 from rich.console import Console
 
@@ -11,11 +10,15 @@ from .config import (
     default_github_token,
     default_path,
     default_priorities,
+    load_installed_data,
+    save_installed_data,
     set_config,
+    unset_config,
 )
 from .constants import DEFAULT_CACHE_SIZE, FORMAT_HELP, VALID_FORMATS
-from .google_fonts import fetch_google_fonts_repo, parse_repo
-from .installer import install_single_repo
+
+if TYPE_CHECKING:
+    from .types import FontEntry, ReleaseInfo
 
 app = typer.Typer(rich_markup_mode="rich")
 console = Console()
@@ -111,6 +114,7 @@ def install(
     parsed_styles = ["roman", "italic"] if style == "both" else [style]
 
     # Update registry if needed
+    from .google_fonts import parse_repo
     from .registry import update_registry
 
     update_registry()
@@ -118,42 +122,98 @@ def install(
     dest_dir = Path.cwd() if local else default_path
     dest_dir.mkdir(exist_ok=True)
 
+    # Fetch releases and download archives of all GitHub repos up front, in
+    # parallel; the installs below then pick them up from memory and the cache
+    prefetched: Dict[Tuple[str, str], ReleaseInfo] = {}
+    github_repos: List[Tuple[str, str]] = []
     for repo_arg in repo:
-        try:
-            if "/" in repo_arg:
-                owner, repo_name = parse_repo(repo_arg)
-                repo_key = repo_name.lower()
-                is_google_fonts = False
-                extract_dir = None
-                is_subdirectory = False
-                source = None
-            else:
-                # Google Fonts
-                font_name = repo_arg
-                owner, repo_name, extract_dir, is_subdirectory, source = (
-                    fetch_google_fonts_repo(font_name)
-                )
-                repo_key = font_name.lower()
-                is_google_fonts = True
-        except ValueError as e:
-            console.print(f"[red]{e}[/red]")
-            continue
-        install_single_repo(
-            owner,
-            repo_name,
-            repo_key,
-            release,
-            priorities,
-            dest_dir,
-            local,
-            force,
-            parsed_weights,
-            parsed_styles,
-            is_google_fonts,
-            pre_extract_dir=extract_dir,
-            is_subdirectory=is_subdirectory,
-            source=source,
-        )
+        if "/" in repo_arg:
+            try:
+                github_repos.append(parse_repo(repo_arg))
+            except ValueError:
+                pass  # reported when installing
+    if len(github_repos) > 1:
+        from .downloader import prefetch_releases
+
+        with console.status("[bold green]Fetching releases..."):
+            prefetched = prefetch_releases(github_repos, release)
+
+    # Load installed data once for the whole batch and save it at the end
+    installed_data = None if local else load_installed_data()
+    try:
+        for repo_arg in repo:
+            _install_repo_arg(
+                repo_arg,
+                release,
+                priorities,
+                dest_dir,
+                local,
+                force,
+                parsed_weights,
+                parsed_styles,
+                installed_data,
+                prefetched,
+            )
+    finally:
+        if installed_data is not None:
+            save_installed_data(installed_data)
+
+
+def _install_repo_arg(
+    repo_arg: str,
+    release: str,
+    priorities: List[str],
+    dest_dir: Path,
+    local: bool,
+    force: bool,
+    weights: List[int],
+    styles: List[str],
+    installed_data: Dict[str, Dict[str, FontEntry]] | None,
+    prefetched: Dict[Tuple[str, str], ReleaseInfo],
+) -> None:
+    """Resolve a single install argument and install it."""
+    from .google_fonts import fetch_google_fonts_repo, parse_repo
+    from .installer import install_single_repo
+
+    try:
+        if "/" in repo_arg:
+            owner, repo_name = parse_repo(repo_arg)
+            preresolved_release = prefetched.get((owner, repo_name))
+            repo_key = repo_name.lower()
+            is_google_fonts = False
+            extract_dir = None
+            is_subdirectory = False
+            source = None
+        else:
+            # Google Fonts
+            font_name = repo_arg
+            owner, repo_name, extract_dir, is_subdirectory, source = (
+                fetch_google_fonts_repo(font_name)
+            )
+            repo_key = font_name.lower()
+            is_google_fonts = True
+            preresolved_release = None
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        return
+    install_single_repo(
+        owner,
+        repo_name,
+        repo_key,
+        release,
+        priorities,
+        dest_dir,
+        local,
+        force,
+        weights,
+        styles,
+        is_google_fonts,
+        pre_extract_dir=extract_dir,
+        is_subdirectory=is_subdirectory,
+        source=source,
+        preresolved_release=preresolved_release,
+        installed_data=installed_data,
+    )
 
 
 @config_app.command("format")
@@ -184,21 +244,7 @@ def config_cache_size(
     Set the download cache size. Set to 0 to disable caching entirely, or 'default' to reset to the default size.
     """
     if value.lower() == "default":
-        from .config import CONFIG_FILE
-
-        current_config: Dict[str, str] = {}
-        if CONFIG_FILE.exists():
-            with open(CONFIG_FILE) as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith("cache-size="):
-                        continue  # remove it
-                    if "=" in line:
-                        k, v = line.split("=", 1)
-                        current_config[k] = v
-        with open(CONFIG_FILE, "w") as f:
-            for k, v in current_config.items():
-                f.write(f"{k}={v}\n")
+        unset_config("cache-size")
         console.print(
             f"[green]Reset cache-size to default: {DEFAULT_CACHE_SIZE}[/green]"
         )
@@ -266,9 +312,11 @@ def config_update_registry(
         )
         return
 
+    from .downloader import get_http_client
+
     try:
         headers: Dict[str, str] = {"Authorization": f"Bearer {default_github_token}"}
-        response = httpx.get("https://api.github.com/user", headers=headers)
+        response = get_http_client().get("https://api.github.com/user", headers=headers)
         if response.status_code == 200:
             user_data = response.json()
             console.print(
@@ -313,6 +361,11 @@ def update(
         None, help="Specific repos to update (leave empty for all)"
     ),
     changelog: bool = typer.Option(False, "--changelog", help="Show changelog"),
+    refresh: bool = typer.Option(
+        False,
+        "--refresh",
+        help="Ask GitHub for the latest releases even if checked in the last day",
+    ),
     verbose: bool = typer.Option(
         False, "--verbose", "-v", help="Enable verbose logging"
     ),
@@ -328,7 +381,7 @@ def update(
     from .updater import update_fonts
 
     update_registry()
-    update_fonts(repos, changelog)
+    update_fonts(repos, changelog, refresh)
 
 
 @app.command()
@@ -339,6 +392,12 @@ def export(
     stdout: bool = typer.Option(
         False, "--stdout", help="Output to stdout instead of file"
     ),
+    pretty: bool | None = typer.Option(
+        None,
+        "--pretty/--compact",
+        help="Indent the JSON; by default only output to stdout is indented",
+        show_default=False,
+    ),
     verbose: bool = typer.Option(
         False, "--verbose", "-v", help="Enable verbose logging"
     ),
@@ -351,7 +410,7 @@ def export(
 
     from .library import export_fonts
 
-    export_fonts(output, stdout)
+    export_fonts(output, stdout, stdout if pretty is None else pretty)
 
 
 @app.command("import")
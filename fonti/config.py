@@ -1,10 +1,11 @@
 import base64
 import json
+import os
+import re
 from pathlib import Path
-from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 
 import typer
-from cryptography.fernet import Fernet
 from diskcache import Cache  # pyright: ignore[reportMissingTypeStubs]
 from platformdirs import user_cache_dir
 from rich.console import Console
@@ -26,82 +27,135 @@ if TYPE_CHECKING:
 
 console = Console()
 
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+def json_loads(data: bytes) -> Any:
+    """Parse JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any, indent: bool = True) -> bytes:
+    """
+    Serialize to JSON, indented by two spaces unless indent is False, using
+    orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, indent=2).encode()
+    return json.dumps(obj, separators=(",", ":")).encode()
+
 
 def get_encryption_key() -> bytes:
     """Get or generate the encryption key for secure config storage."""
     if KEY_FILE.exists():
         return KEY_FILE.read_bytes()
     else:
+        from cryptography.fernet import Fernet
+
         key = Fernet.generate_key()
         KEY_FILE.parent.mkdir(exist_ok=True)
         KEY_FILE.write_bytes(key)
         return key
 
 
-# Load default format from config file
-def load_config() -> Tuple[List[str], Path, int, str, bool, int]:
-    """Load configuration from config file."""
-    priorities = DEFAULT_PRIORITIES.copy()
-    path = DEFAULT_PATH
-    cache_size = DEFAULT_CACHE_SIZE
-    github_token = ""
-    google_fonts_direct = DEFAULT_GOOGLE_FONTS_DIRECT
-    registry_check_interval = DEFAULT_REGISTRY_CHECK_INTERVAL
+# A key=value line of the config file
+CONFIG_LINE_RE = re.compile(r"^\s*([\w-]+)=(.*?)\s*$", re.MULTILINE)
 
-    fernet = Fernet(get_encryption_key())
 
-    if CONFIG_FILE.exists():
+def _read_config_file() -> Dict[str, str]:
+    """Read the raw key/value pairs of the config file, if there is one."""
+    try:
+        return dict(CONFIG_LINE_RE.findall(CONFIG_FILE.read_text()))
+    except FileNotFoundError:
+        return {}
+
+
+def _write_config_file(config: Dict[str, str]) -> None:
+    """Write raw key/value pairs to the config file, exiting on failure."""
+    try:
+        CONFIG_FILE.parent.mkdir(exist_ok=True)
+        CONFIG_FILE.write_text("".join(f"{k}={v}\n" for k, v in config.items()))
+    except Exception as e:
+        console.print(f"[red]Error writing config: {e}[/red]")
+        raise typer.Exit(1) from e
+
+
+def _parse_format(value: str) -> Optional[List[str]]:
+    if value == "auto":
+        return None
+    priorities = [p.strip() for p in value.split(",")]
+    return priorities if all(p in DEFAULT_PRIORITIES for p in priorities) else None
+
+
+def _parse_path(value: str) -> Optional[Path]:
+    return Path(value) if value else None
+
+
+def _parse_int_setting(key: str) -> Callable[[str], Optional[int]]:
+    def parse(value: str) -> Optional[int]:
         try:
-            with open(CONFIG_FILE) as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith("format="):
-                        value = line.split("=", 1)[1].strip()
-                        if value == "auto":
-                            continue
-                        parsed_priorities = [p.strip() for p in value.split(",")]
-                        if all(p in DEFAULT_PRIORITIES for p in parsed_priorities):
-                            priorities = parsed_priorities
-                    elif line.startswith("path="):
-                        value = line.split("=", 1)[1].strip()
-                        if value:
-                            path = Path(value)
-                    elif line.startswith("cache-size="):
-                        value = line.split("=", 1)[1].strip()
-                        try:
-                            cache_size = int(value)
-                        except ValueError:
-                            console.print(
-                                "[yellow]Warning: Invalid cache-size, using default.[/yellow]"
-                            )
-                    elif line.startswith("github_token="):
-                        encrypted_value = line.split("=", 1)[1].strip()
-                        try:
-                            github_token = fernet.decrypt(
-                                base64.b64decode(encrypted_value)
-                            ).decode()
-                        except Exception:
-                            console.print(
-                                "[yellow]Warning: Could not decrypt GitHub token.[/yellow]"
-                            )
-                    elif line.startswith("registry_check_interval="):
-                        value = line.split("=", 1)[1].strip()
-                        try:
-                            registry_check_interval = int(value)
-                        except ValueError:
-                            console.print(
-                                "[yellow]Warning: Invalid registry_check_interval, using default.[/yellow]"
-                            )
-        except Exception:
-            console.print("[yellow]Warning: Could not load config file.[/yellow]")
+            return int(value)
+        except ValueError:
+            console.print(f"[yellow]Warning: Invalid {key}, using default.[/yellow]")
+            return None
+
+    return parse
+
+
+def _parse_github_token(value: str) -> Optional[str]:
+    # The key is only read when a token is actually set
+    from cryptography.fernet import Fernet
+
+    try:
+        fernet = Fernet(get_encryption_key())
+        return fernet.decrypt(base64.b64decode(value)).decode()
+    except Exception:
+        console.print("[yellow]Warning: Could not decrypt GitHub token.[/yellow]")
+        return None
+
+
+# Parser of each config key, returning None to keep the default
+CONFIG_PARSERS: Dict[str, Callable[[str], Any]] = {
+    "format": _parse_format,
+    "path": _parse_path,
+    "cache-size": _parse_int_setting("cache-size"),
+    "github_token": _parse_github_token,
+    "registry_check_interval": _parse_int_setting("registry_check_interval"),
+}
+
+
+# Load default format from config file
+def load_config() -> Tuple[List[str], Path, int, str, bool, int]:
+    """Load configuration from config file."""
+    settings: Dict[str, Any] = {}
+    try:
+        for key, value in _read_config_file().items():
+            parser = CONFIG_PARSERS.get(key)
+            if parser is None:
+                continue
+            parsed = parser(value)
+            if parsed is not None:
+                settings[key] = parsed
+    except Exception:
+        console.print("[yellow]Warning: Could not load config file.[/yellow]")
 
     return (
-        priorities,
-        path,
-        cache_size,
-        github_token,
-        google_fonts_direct,
-        registry_check_interval,
+        settings.get("format", DEFAULT_PRIORITIES.copy()),
+        settings.get("path", DEFAULT_PATH),
+        settings.get("cache-size", DEFAULT_CACHE_SIZE),
+        # Fall back to the token the GitHub CLI and Actions use
+        settings.get("github_token")
+        or os.environ.get("GITHUB_TOKEN")
+        or os.environ.get("GH_TOKEN", ""),
+        DEFAULT_GOOGLE_FONTS_DIRECT,
+        settings.get("registry_check_interval", DEFAULT_REGISTRY_CHECK_INTERVAL),
     )
 
 
@@ -132,16 +186,10 @@ else:
 def set_config(key: str, value: str) -> None:
     """Set a configuration key-value pair."""
     current_config: Dict[str, str] = {}
-    if CONFIG_FILE.exists():
-        try:
-            with open(CONFIG_FILE) as f:
-                for line in f:
-                    line = line.strip()
-                    if "=" in line:
-                        k, v = line.split("=", 1)
-                        current_config[k] = v
-        except Exception:
-            console.print("[yellow]Warning: Could not load existing config.[/yellow]")
+    try:
+        current_config = _read_config_file()
+    except Exception:
+        console.print("[yellow]Warning: Could not load existing config.[/yellow]")
 
     if key == "format":
         priorities = [p.strip() for p in value.split(",")]
@@ -155,6 +203,8 @@ def set_config(key: str, value: str) -> None:
             console.print("[red]Invalid cache size: must be integer[/red]")
             raise typer.Exit(1) from None
     elif key == "github_token":
+        from cryptography.fernet import Fernet
+
         fernet = Fernet(get_encryption_key())
         encrypted = base64.b64encode(fernet.encrypt(value.encode())).decode()
         value = encrypted
@@ -170,24 +220,58 @@ def set_config(key: str, value: str) -> None:
         f"[green]Set {key} to: {'***' if key == 'github_token' else value}[/green]"
     )
 
-    try:
-        with open(CONFIG_FILE, "w") as f:
-            for k, v in current_config.items():
-                f.write(f"{k}={v}\n")
-    except Exception as e:
-        console.print(f"[red]Error writing config: {e}[/red]")
-        raise typer.Exit(1) from e
+    _write_config_file(current_config)
+
+
+def unset_config(key: str) -> None:
+    """Remove a configuration key, going back to its default."""
+    current_config = _read_config_file()
+    if current_config.pop(key, None) is not None:
+        _write_config_file(current_config)
+
+
+# FontEntry fields whose values repeat across every font of a repo
+SHARED_ENTRY_FIELDS = ("type", "version", "owner", "repo_name")
+
+# Serialized form of installed.json as last read or written by this process
+_installed_snapshot: Optional[bytes] = None
+# Installed data as last loaded or saved; the file only changes through this
+# process during a command, so it is parsed at most once
+_installed_data: Optional[Dict[str, Dict[str, FontEntry]]] = None
+
+
+def _share_entry_values(data: Dict[str, Dict[str, FontEntry]]) -> None:
+    """Make font entries reuse one string object per distinct field value."""
+    memo: Dict[str, str] = {}
+    for fonts in data.values():
+        for entry in fonts.values():
+            for field in SHARED_ENTRY_FIELDS:
+                value = entry.get(field)
+                if isinstance(value, str):
+                    entry[field] = memo.setdefault(value, value)  # type: ignore[literal-required]
 
 
 def load_installed_data() -> Dict[str, Dict[str, FontEntry]]:
-    """Load installed fonts data from file."""
+    """
+    Load installed fonts data from file.
+
+    The same dict is returned on every call, so changes made to it by one caller
+    are seen by the next.
+    """
+    global _installed_snapshot, _installed_data
+    if _installed_data is not None:
+        return _installed_data
     if not INSTALLED_FILE.exists():
-        return {}
+        _installed_data = {}
+        return _installed_data
     try:
-        with open(INSTALLED_FILE) as f:
-            data = json.load(f)
+        raw = INSTALLED_FILE.read_bytes()
+        data = json_loads(raw)
+        _installed_snapshot = raw
         # Normalize keys to lower case for case-insensitive matching
         normalized = {k.lower(): v for k, v in data.items()}
+        _share_entry_values(normalized)
+        _installed_data = normalized
         return normalized
     except Exception as e:
         console.print(f"[yellow]Warning: Could not load installed data: {e}[/yellow]")
@@ -195,10 +279,18 @@ def load_installed_data() -> Dict[str, Dict[str, FontEntry]]:
 
 
 def save_installed_data(data: Dict[str, Dict[str, FontEntry]]) -> None:
-    """Save installed fonts data to file."""
+    """Save installed fonts data to file, skipping the write when unchanged."""
+    global _installed_snapshot, _installed_data
+    _installed_data = data
     INSTALLED_FILE.parent.mkdir(exist_ok=True)
     try:
-        with open(INSTALLED_FILE, "w") as f:
-            json.dump(data, f, indent=2)
+        payload = json_dumps(data)
+        if payload == _installed_snapshot and INSTALLED_FILE.exists():
+            return
+        # Write a sibling file and swap it in so a crash never truncates the registry
+        tmp = INSTALLED_FILE.with_suffix(".json.tmp")
+        tmp.write_bytes(payload)
+        os.replace(tmp, INSTALLED_FILE)
+        _installed_snapshot = payload
     except Exception as e:
         console.print(f"[yellow]Warning: Could not save installed data: {e}[/yellow]")
@@ -2,7 +2,8 @@ import platform
 from pathlib import Path
 
 # Constants
-ARCHIVE_EXTENSIONS = [".zip", ".tar.xz", ".tar.gz", ".tgz"]
+ARCHIVE_EXTENSIONS = (".zip", ".tar.xz", ".tar.gz", ".tgz")
+FONT_EXTENSIONS = (".ttf", ".otf", ".woff", ".woff2")
 VALID_FORMATS = [
     "variable-ttf",
     "otf",
@@ -13,6 +14,10 @@ VALID_FORMATS = [
     "static-woff",
 ]
 DEFAULT_PRIORITIES = ["variable-ttf", "otf", "static-ttf"]
+# Web formats, which should not be installed globally without --force
+WOFF_PRIORITIES = frozenset(
+    {"variable-woff2", "variable-woff", "static-woff2", "static-woff"}
+)
 
 # Platform-specific default font directory
 system = platform.system()
@@ -1,24 +1,101 @@
+import atexit
+import functools
+import importlib.util
+import io
 import logging
+import os
 import shutil
+import stat
+import subprocess
 import tarfile
 import tempfile
+import threading
+import time
 import zipfile
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager, nullcontext, suppress
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, List, Tuple, Union, cast, overload
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    cast,
+)
 
 import httpx
 from rich.console import Console
 
 from .config import CACHE_DIR, cache, default_github_token
-from .constants import ARCHIVE_EXTENSIONS
+from .constants import ARCHIVE_EXTENSIONS, FONT_EXTENSIONS
 
 if TYPE_CHECKING:
-    from .types import Asset
+    from concurrent.futures import Future
+
+    from .types import Asset, ReleaseInfo
 
 console = Console()
 logger = logging.getLogger(__name__)
 
+# GitHub requests made at once when fetching several repositories, whether
+# installing, importing or checking for updates; kept low to stay clear of
+# GitHub's secondary rate limits
+GITHUB_WORKERS = 4
+
+# How long the ETag of a latest release is kept for revalidation
+RELEASE_ETAG_TTL = 7 * 24 * 60 * 60  # 7 days
+
+# How long update trusts a cached latest release without asking GitHub
+LATEST_RELEASE_MAX_AGE = 24 * 60 * 60  # 24 hours
+
+# Size of the chunks downloads are read and written in; httpx yields whatever
+# each network read returns otherwise
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # 1MB
+
+# Preference of each archive format, lower is better: xz compresses best and
+# tar archives can be extracted as they download
+ARCHIVE_PRIORITIES = {".tar.xz": 1, ".tar.gz": 2, ".tgz": 2, ".zip": 3}
+
+# Shell pattern selecting the members tar and unzip extract: a single pattern
+# catching .ttf, .otf, .woff and .woff2 in any case, since GNU tar fails when
+# any of several patterns matches nothing. Stray matches are dropped later.
+FONT_MEMBER_GLOB = "*.[tToOwW][tToO][fF]*"
+
+# Zip archives that are not cached are downloaded into memory up to this size
+# before spilling over to a temporary file
+SPOOL_MAX_SIZE = 64 << 20  # 64MB
+
+# Copy buffer used when extracting archive members; the stdlib defaults are
+# 16KB for tar and 64KB for zip
+EXTRACT_BUFFER_SIZE = 1 << 20  # 1MB
+
+
+_http_client: httpx.Client | None = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Get the HTTP client shared by all requests, so connections are pooled and
+    reused across API calls and downloads.
+
+    HTTP/2 is used when the h2 package is installed, multiplexing concurrent
+    requests to the same host over one connection.
+    """
+    global _http_client
+    # Release lookups run in worker threads, which must not each create one
+    with _http_client_lock:
+        if _http_client is None:
+            http2 = importlib.util.find_spec("h2") is not None
+            _http_client = httpx.Client(http2=http2, headers={"User-Agent": "fonti"})
+            atexit.register(_http_client.close)
+    return _http_client
+
 
 def _is_safe_archive_path(path: str, extract_dir: Path) -> bool:
     """
@@ -56,49 +133,225 @@ def _is_safe_archive_path(path: str, extract_dir: Path) -> bool:
         return False
 
 
-@overload
 def _get_safe_members(
-    archive: zipfile.ZipFile, archive_type: str, extract_dir: Path
-) -> List[str]: ...
+    archive: zipfile.ZipFile, extract_dir: Path
+) -> List[zipfile.ZipInfo]:
+    """Get zip archive members that are safe to extract."""
+    safe_members: List[zipfile.ZipInfo] = []
+    for info in archive.infolist():
+        if _is_safe_archive_path(info.filename, extract_dir):
+            safe_members.append(info)
+        else:
+            console.print(
+                f"[yellow]Skipping unsafe archive member: {info.filename}[/yellow]"
+            )
+    return safe_members
+
+
+def _extract_zip(archive_path: Path | str | BinaryIO, extract_dir: Path) -> None:
+    """Extract the safe font members of a zip archive using large copy buffers."""
+    with zipfile.ZipFile(archive_path, "r") as archive_ref:
+        for info in _get_safe_members(archive_ref, extract_dir):
+            if info.is_dir() or not _is_font_member(info.filename):
+                continue
+            target = extract_dir / info.filename
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with archive_ref.open(info) as src, open(target, "wb") as dst:
+                shutil.copyfileobj(src, dst, EXTRACT_BUFFER_SIZE)
+            # Keep the archived modification time, as unzip does, so cached
+            # font metadata is found again on later runs
+            with suppress(OverflowError, ValueError, OSError):
+                mtime = time.mktime(info.date_time + (0, 0, -1))
+                os.utime(target, (mtime, mtime))
+
+
+class _ResponseReader(io.RawIOBase):
+    """
+    Read-only file object over the body of a streamed HTTP response, optionally
+    writing everything it receives to a second file.
+    """
 
+    def __init__(self, chunks: Iterator[bytes], copy: BinaryIO | None = None):
+        self._chunks = chunks
+        self._copy = copy
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            if self._copy is not None:
+                self._copy.write(chunk)
+            self._pending = memoryview(chunk)
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def drain(self) -> None:
+        """Consume the rest of the response, so that the copy is complete."""
+        for chunk in self._chunks:
+            if self._copy is not None:
+                self._copy.write(chunk)
+
+
+@contextmanager
+def _open_tar_stream(
+    archive: Path | str | BinaryIO, archive_ext: str
+) -> Iterator[tarfile.TarFile]:
+    """
+    Open a tar archive, given as a path or a file object, for sequential reading.
 
-@overload
-def _get_safe_members(
-    archive: tarfile.TarFile, archive_type: str, extract_dir: Path
-) -> List[tarfile.TarInfo]: ...
+    .tar.gz archives are inflated with ISA-L when python-isal is installed.
+    """
+    if archive_ext == ".tar.gz":
+        try:
+            from isal import igzip
+        except ImportError:
+            pass
+        else:
+            with (
+                igzip.open(archive, "rb") as gz_file,
+                tarfile.open(fileobj=gz_file, mode="r|") as archive_ref,
+            ):
+                yield archive_ref
+            return
+    mode = "r|xz" if archive_ext == ".tar.xz" else "r|gz"
+    if isinstance(archive, (Path, str)):
+        archive_ref = tarfile.open(archive, mode)
+    else:
+        archive_ref = tarfile.open(fileobj=archive, mode=mode)
+    with archive_ref:
+        yield archive_ref
 
 
-def _get_safe_members(
-    archive: Union[zipfile.ZipFile, tarfile.TarFile],
-    archive_type: str,
-    extract_dir: Path,
-) -> Union[List[str], List[tarfile.TarInfo]]:
-    """Get archive members that are safe to extract."""
-    if archive_type == "zip":
-        members = cast("List[str]", archive.namelist())  # type: ignore[attr-defined]
-    else:  # tar
-        members = cast("List[str]", archive.getnames())  # type: ignore[attr-defined]
-
-    safe_members: Any = []
-    for member in members:
-        if _is_safe_archive_path(member, extract_dir):
-            if archive_type == "zip":
-                safe_members.append(member)
-            else:  # tar
-                safe_members.append(archive.getmember(member))  # type: ignore[attr-defined]
-        else:
-            console.print(f"[yellow]Skipping unsafe archive member: {member}[/yellow]")
+def _extract_tar(
+    archive: Path | str | BinaryIO, archive_ext: str, extract_dir: Path
+) -> None:
+    """Stream the safe font members of a tar archive to disk using large copy buffers."""
+    with _open_tar_stream(archive, archive_ext) as archive_ref:
+        archive_ref.copybufsize = EXTRACT_BUFFER_SIZE
+        for member in archive_ref:
+            if not member.isfile() or not _is_font_member(member.name):
+                continue
+            if not _is_safe_archive_path(member.name, extract_dir):
+                console.print(
+                    f"[yellow]Skipping unsafe archive member: {member.name}[/yellow]"
+                )
+                continue
+            archive_ref.extract(member, extract_dir)
+
+
+def _is_font_member(name: str) -> bool:
+    return name.lower().endswith(FONT_EXTENSIONS)
+
+
+@functools.cache
+def _find_tool(name: str) -> Optional[str]:
+    return shutil.which(name)
+
+
+@functools.cache
+def _is_gnu_tar(tar: str) -> bool:
+    result = subprocess.run([tar, "--version"], capture_output=True, check=False)
+    return b"GNU tar" in result.stdout
+
+
+def _zip_is_plain(archive_path: Path | str, extract_dir: Path) -> bool:
+    """Check that a zip archive has no unsafe paths and no symlinks."""
+    with zipfile.ZipFile(archive_path, "r") as archive_ref:
+        for info in archive_ref.infolist():
+            if not _is_safe_archive_path(info.filename, extract_dir):
+                return False
+            if stat.S_ISLNK(info.external_attr >> 16):
+                return False
+    return True
+
+
+def _has_symlinks(directory: Path) -> bool:
+    for root, dirs, files in os.walk(directory):
+        if any(os.path.islink(os.path.join(root, name)) for name in dirs + files):
+            return True
+    return False
+
+
+def _extract_with_tool(
+    archive_path: Path | str, archive_ext: str, extract_dir: Path
+) -> bool:
+    """
+    Extract an archive with the system tar or unzip, which unpack members in C.
 
-    if archive_type == "zip":
-        return cast("List[str]", safe_members)
+    tar refuses members that escape the target directory on its own, and any
+    symlink it extracts sends the archive back through the Python extractor;
+    zip archives are checked beforehand. Returns False, leaving extract_dir
+    empty, if no tool is available or the archive has to go through the
+    safe-member filter.
+    """
+    if archive_ext == ".zip":
+        unzip = _find_tool("unzip")
+        if unzip is None or not _zip_is_plain(archive_path, extract_dir):
+            return False
+        command = [unzip, "-qq", "-o", str(archive_path), FONT_MEMBER_GLOB]
+        command.extend(["-d", str(extract_dir)])
     else:
-        return cast("List[tarfile.TarInfo]", safe_members)
+        tar = _find_tool("tar") or _find_tool("bsdtar")
+        if tar is None:
+            return False
+        command = [tar, "-xf", str(archive_path), "-C", str(extract_dir)]
+        command.append("--no-same-owner")
+        # GNU tar only matches member names literally unless told otherwise
+        if _is_gnu_tar(tar):
+            command.append("--wildcards")
+        command.append(FONT_MEMBER_GLOB)
+
+    result = subprocess.run(command, capture_output=True, check=False)
+    # unzip exits with 11 when nothing matched, i.e. the archive has no fonts
+    succeeded = result.returncode == 0 or (
+        archive_ext == ".zip" and result.returncode == 11
+    )
+    if succeeded and not _has_symlinks(extract_dir):
+        return True
+    logger.debug(
+        f"{command[0]} could not safely extract {archive_path}: "
+        f"{result.stderr.decode().strip()}"
+    )
+    shutil.rmtree(extract_dir)
+    extract_dir.mkdir()
+    return False
 
 
+def extract_archive(
+    archive: Path | str | BinaryIO, archive_ext: str, extract_dir: Path
+) -> None:
+    """
+    Extract a zip or tar archive into a directory, skipping unsafe members.
+
+    Archives on disk are handed to the system tar/unzip when available. They
+    may also be given as a file object, which must be seekable for zip.
+    """
+    logger.debug(f"Extracting {archive} to {extract_dir}")
+    if isinstance(archive, (Path, str)) and _extract_with_tool(
+        archive, archive_ext, extract_dir
+    ):
+        return
+    if archive_ext == ".zip":
+        if not isinstance(archive, (Path, str)) and not archive.seekable():
+            raise TypeError("zip archives must be extracted from a seekable file")
+        _extract_zip(archive, extract_dir)
+    else:
+        _extract_tar(archive, archive_ext, extract_dir)
+
+
+@functools.lru_cache(maxsize=256)
 def get_base_and_ext(name: str) -> tuple[str, str]:
-    for ext in ARCHIVE_EXTENSIONS:
-        if name.endswith(ext):
-            return name[: -len(ext)], ext
+    # Most asset names are not archives; reject them with a single tuple check
+    if name.endswith(ARCHIVE_EXTENSIONS):
+        ext = next(e for e in ARCHIVE_EXTENSIONS if name.endswith(e))
+        return name[: -len(ext)], ext
     return name, ""
 
 
@@ -119,7 +372,7 @@ def get_subdirectory_version(dir_font_name: str) -> str:
     try:
         url = f"https://api.github.com/repos/google/fonts/commits?path={path}"
         logger.debug(f"Fetching commits for path {path} from {url}")
-        response = httpx.get(url, headers=headers)
+        response = get_http_client().get(url, headers=headers)
         response.raise_for_status()
         commits = response.json()
         if commits:
@@ -139,7 +392,7 @@ def get_fonts_dir_version(owner: str, repo_name: str) -> str:
 
     url = f"https://api.github.com/repos/{owner}/{repo_name}/commits?path=fonts"
     logger.debug(f"Fetching commits for fonts directory from {url}")
-    response = httpx.get(url, headers=headers)
+    response = get_http_client().get(url, headers=headers)
     response.raise_for_status()
     commits = response.json()
     if commits:
@@ -158,13 +411,13 @@ def download_fonts_dir(owner: str, repo_name: str) -> Path:
         """Recursively collect font files from the path."""
         api_url = f"https://api.github.com/repos/{owner}/{repo_name}/contents/{path}"
         logger.debug(f"Collecting font files from {api_url}")
-        response = httpx.get(api_url, headers=headers)
+        response = get_http_client().get(api_url, headers=headers)
         response.raise_for_status()
         contents = response.json()
         font_files: List[Dict[str, Any]] = []
         for item in contents:
-            if item["type"] == "file" and item["name"].endswith(
-                (".ttf", ".otf", ".woff", ".woff2")
+            if item["type"] == "file" and item["name"].lower().endswith(
+                FONT_EXTENSIONS
             ):
                 font_files.append(item)
             elif item["type"] == "dir":
@@ -179,7 +432,7 @@ def download_fonts_dir(owner: str, repo_name: str) -> Path:
     for item in font_files:
         file_url = item["download_url"]
         logger.debug(f"Downloading font file from {file_url}")
-        file_response = httpx.get(file_url, headers=headers)
+        file_response = get_http_client().get(file_url, headers=headers)
         file_response.raise_for_status()
         # Keep the relative path
         rel_path = Path(item["path"]).relative_to("fonts")
@@ -190,29 +443,97 @@ def download_fonts_dir(owner: str, repo_name: str) -> Path:
     return temp_dir
 
 
+def _get_release_json(
+    url: str, headers: Dict[str, str], immutable: bool, max_age: float = 0
+) -> Dict[str, Any]:
+    """
+    Get a release from the GitHub API, going through the cache if enabled.
+
+    Tagged releases are immutable and served from the cache without a request,
+    as are others fetched less than max_age seconds ago. The rest are
+    revalidated with their ETag, a 304 reusing the cached body.
+    """
+    key = ("release", url)
+    cached = cache.get(key) if cache is not None else None  # type: ignore
+    if cached is not None and (
+        immutable or time.time() - cached[2] < max_age  # type: ignore
+    ):
+        logger.debug(f"Using cached release for {url}")
+        return cached[1]  # type: ignore
+
+    request_headers = headers
+    if cached is not None and cached[0]:  # type: ignore
+        request_headers = {**headers, "If-None-Match": cached[0]}  # type: ignore
+    response = get_http_client().get(
+        url, headers=request_headers, follow_redirects=True
+    )
+    if (
+        response.status_code in (403, 429)
+        and response.headers.get("X-RateLimit-Remaining") == "0"
+    ):
+        raise httpx.HTTPStatusError(
+            "GitHub API rate limit exceeded. Set a token with 'fonti config "
+            "github-token' or the GITHUB_TOKEN environment variable to raise it.",
+            request=response.request,
+            response=response,
+        )
+    if response.status_code == 304 and cached is not None:
+        logger.debug(f"Release unchanged for {url}")
+        release_data: Dict[str, Any] = cached[1]  # type: ignore
+        etag = cached[0]  # type: ignore
+    else:
+        response.raise_for_status()
+        release_data = response.json()
+        etag = response.headers.get("ETag")
+    if cache is not None:
+        cache.set(  # type: ignore
+            key,
+            (etag, release_data, time.time()),
+            expire=None if immutable else RELEASE_ETAG_TTL,
+        )
+    return release_data
+
+
 def fetch_release_info(
-    owner: str, repo_name: str, release: str
-) -> Tuple[str, List[Asset], str, str, str]:
-    """Fetch release information from GitHub API."""
+    owner: str,
+    repo_name: str,
+    release: str,
+    quiet: bool = False,
+    max_age: float = 0,
+) -> ReleaseInfo:
+    """
+    Fetch release information from GitHub API.
+
+    With quiet, no status spinner is shown, so that it can run in a worker
+    thread, and failures are left for the caller to report. A cached latest
+    release younger than max_age seconds is used without revalidating it.
+    """
     logger.info(f"Fetching release info for {owner}/{repo_name}")
+    log_failure = logger.debug if quiet else logger.error
     headers: Dict[str, str] = {}
     if default_github_token:
         headers["Authorization"] = f"Bearer {default_github_token}"
 
-    with console.status("[bold green]Fetching release info..."):
+    status = (
+        nullcontext()
+        if quiet
+        else console.status("[bold green]Fetching release info...")
+    )
+    with status:
         if release == "latest":
             url = f"https://api.github.com/repos/{owner}/{repo_name}/releases/latest"
             logger.debug(f"Fetching latest release from {url}")
             try:
-                response = httpx.get(url, headers=headers, follow_redirects=True)
-                response.raise_for_status()
+                release_data = _get_release_json(
+                    url, headers, immutable=False, max_age=max_age
+                )
             except httpx.HTTPStatusError as e:
                 if e.response.status_code == 404 and owner == "thegooglefontsrepo":
                     # For subdirectory fonts, get commit date
                     version = get_subdirectory_version(repo_name)
                     return version, [], "", owner, repo_name
                 else:
-                    logger.error(f"Failed to fetch latest release: {e}")
+                    log_failure(f"Failed to fetch latest release: {e}")
                     raise
         else:
             release_tag = release
@@ -220,20 +541,17 @@ def fetch_release_info(
                 release_tag = f"v{release}"
             url = f"https://api.github.com/repos/{owner}/{repo_name}/releases/tags/{release_tag}"
             try:
-                response = httpx.get(url, headers=headers, follow_redirects=True)
-                response.raise_for_status()
+                release_data = _get_release_json(url, headers, immutable=True)
             except httpx.HTTPStatusError as e:
                 if e.response.status_code == 404 and not release.startswith("v"):
                     # Try without 'v'
                     url = f"https://api.github.com/repos/{owner}/{repo_name}/releases/tags/{release}"
                     logger.debug(f"Fetching release from {url}")
-                    response = httpx.get(url, headers=headers, follow_redirects=True)
-                    response.raise_for_status()
+                    release_data = _get_release_json(url, headers, immutable=True)
                 else:
-                    logger.error(f"Failed to fetch release {release}: {e}")
+                    log_failure(f"Failed to fetch release {release}: {e}")
                     raise
 
-        release_data: Dict[str, Any] = response.json()
         version = release_data["tag_name"]
         assets: List[Asset] = release_data.get("assets", [])
         body = release_data.get("body", "")
@@ -247,42 +565,161 @@ def fetch_release_info(
 
 def select_archive_asset(assets: List[Asset]) -> Asset:
     """Select the best archive asset from the list."""
-    archives = [
-        a for a in assets if any(a["name"].endswith(ext) for ext in ARCHIVE_EXTENSIONS)
-    ]
-    if not archives:
+    # Group archives by base name, splitting each name only once
+    groups: defaultdict[str, list[tuple[Asset, int]]] = defaultdict(list)
+    for a in assets:
+        base, ext = get_base_and_ext(a["name"])
+        if ext:
+            groups[base].append((a, ARCHIVE_PRIORITIES[ext]))
+    if not groups:
         raise ValueError("No archive asset found in the release.")
 
-    # Function to get priority for extensions (lower is better)
-    def get_priority(ext: str) -> int:
-        priorities_dict = {".tar.xz": 1, ".tar.gz": 2, ".tgz": 2, ".zip": 3}
-        return priorities_dict.get(ext, 4)
+    # Choose the best asset from each group, by priority then size
+    best_assets = [
+        min(items, key=lambda x: (x[1], x[0]["size"])) for items in groups.values()
+    ]
 
-    # Group archives by base name
-    groups: defaultdict[str, list[tuple[Asset, str]]] = defaultdict(list)
-    for a in archives:
-        base, ext = get_base_and_ext(a["name"])
-        groups[base].append((a, ext))
+    # If multiple groups, choose the overall best, by size then priority
+    best_asset, _ = min(best_assets, key=lambda x: (x[0]["size"], x[1]))
+    return best_asset
 
-    # Choose the best asset from each group
-    best_assets: list[Asset] = []
-    for items in groups.values():
-        if len(items) == 1:
-            best_assets.append(items[0][0])
-        else:
-            # Sort by priority ascending, then by size ascending
-            sorted_items = sorted(
-                items, key=lambda x: (get_priority(x[1]), x[0]["size"])
-            )
-            best_assets.append(sorted_items[0][0])
 
-    # If multiple groups, choose the overall best
-    if len(best_assets) > 1:
-        best_assets.sort(
-            key=lambda a: (a["size"], get_priority(get_base_and_ext(a["name"])[1]))
-        )
+def _archive_cache_key(
+    owner: str,
+    repo_name: str,
+    version: str,
+    archive_ext: str,
+    is_google_fonts: bool = False,
+) -> str:
+    """Get the cache key of a release archive."""
+    if is_google_fonts:
+        return f"{repo_name}-{version}{archive_ext}"
+    return f"{owner}-{repo_name}-{version}{archive_ext}"
+
 
-    return best_assets[0]
+def _fits_in_cache(size: int) -> bool:
+    """Check if a downloaded archive of the given size should be cached."""
+    return cache is not None and size <= cache.size_limit  # type: ignore
+
+
+def _download_file(url: str, path: Path | BinaryIO) -> None:
+    """Stream a download to a file, given by path or as a file object."""
+    with get_http_client().stream("GET", url, follow_redirects=True) as response:
+        response.raise_for_status()
+        with open(path, "wb") if isinstance(path, Path) else nullcontext(path) as f:
+            for chunk in response.iter_bytes(DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+
+
+def _prefetch_release(owner: str, repo_name: str, release: str) -> ReleaseInfo:
+    """
+    Fetch the release info of a repository and download its archive into the
+    cache, without printing anything.
+    """
+    release_info = fetch_release_info(owner, repo_name, release, quiet=True)
+    tag, assets, _, final_owner, final_repo_name = release_info
+    if cache is None or not assets:
+        return release_info
+    try:
+        asset = select_archive_asset(assets)
+    except Exception:
+        return release_info  # no archive; the install reports it
+    _, archive_ext = get_base_and_ext(asset["name"])
+    if not _fits_in_cache(asset["size"]):
+        return release_info
+    # Installs key archives by the requested release, or the tag for latest
+    version = tag if release == "latest" else release
+    key = _archive_cache_key(final_owner, final_repo_name, version, archive_ext)
+    if key in cache:
+        return release_info
+
+    logger.debug(f"Prefetching archive {asset['name']}")
+    cache_path = CACHE_DIR / key
+    # Each download gets its own partial file, since repositories that
+    # redirect to the same one share a cache key
+    tmp_file = tempfile.NamedTemporaryFile(dir=CACHE_DIR, suffix=".part", delete=False)
+    partial_path = Path(tmp_file.name)
+    tmp_file.close()
+    try:
+        _download_file(asset["browser_download_url"], partial_path)
+        os.replace(partial_path, cache_path)
+    finally:
+        partial_path.unlink(missing_ok=True)
+    cache[key] = str(cache_path)
+    return release_info
+
+
+def prefetch_releases(
+    repos: List[Tuple[str, str]], release: str
+) -> Dict[Tuple[str, str], ReleaseInfo]:
+    """
+    Fetch the release info of several repositories concurrently, downloading
+    their archives into the cache along the way.
+
+    Installing the repositories one after the other then only waits on the
+    slowest download rather than on all of them. Repositories that fail are
+    left out and reported by the install itself.
+    """
+    release_infos: Dict[Tuple[str, str], ReleaseInfo] = {}
+    futures: Dict[Tuple[str, str], Future[ReleaseInfo]] = {}
+    with ThreadPoolExecutor(max_workers=GITHUB_WORKERS) as executor:
+        # GitHub names are case-insensitive; fetch each repository only once
+        submitted: Dict[Tuple[str, str], Future[ReleaseInfo]] = {}
+        for owner, repo_name in repos:
+            name = (owner.lower(), repo_name.lower())
+            if name not in submitted:
+                submitted[name] = executor.submit(
+                    _prefetch_release, owner, repo_name, release
+                )
+            futures[owner, repo_name] = submitted[name]
+    for (owner, repo_name), future in futures.items():
+        try:
+            release_infos[owner, repo_name] = future.result()
+        except Exception as e:
+            logger.debug(f"Could not prefetch {owner}/{repo_name}: {e}")
+    return release_infos
+
+
+def _download_and_extract_tar(
+    archive_url: str, archive_ext: str, extract_dir: Path, key: str
+) -> None:
+    """
+    Extract a tar archive as it downloads, saving the downloaded bytes to the
+    cache along the way if it is enabled, so the archive is never read back.
+    """
+    logger.debug(f"Streaming archive from {archive_url}")
+    cache_path = CACHE_DIR / key
+    partial_path: Path | None = None
+    try:
+        with ExitStack() as stack:
+            copy: BinaryIO | None = None
+            if cache is not None:
+                # Its own partial file, as other installs may download the same
+                # archive at the same time
+                copy = cast(
+                    "BinaryIO",
+                    stack.enter_context(
+                        tempfile.NamedTemporaryFile(
+                            dir=CACHE_DIR, suffix=".part", delete=False
+                        )
+                    ),
+                )
+                partial_path = Path(copy.name)
+            response = stack.enter_context(
+                get_http_client().stream("GET", archive_url, follow_redirects=True)
+            )
+            response.raise_for_status()
+            reader = _ResponseReader(response.iter_bytes(DOWNLOAD_CHUNK_SIZE), copy)
+            extract_archive(reader, archive_ext, extract_dir)
+            reader.drain()
+        if partial_path is not None and _fits_in_cache(partial_path.stat().st_size):
+            os.replace(partial_path, cache_path)
+            cache[key] = str(cache_path)
+            console.print("Archive cached.")
+            logger.debug("Archive cached")
+    finally:
+        if partial_path is not None:
+            partial_path.unlink(missing_ok=True)
 
 
 def get_or_download_and_extract_archive(
@@ -295,11 +732,7 @@ def get_or_download_and_extract_archive(
     is_google_fonts: bool = False,
 ) -> Path:
     """Get archive from cache or download and extract to a temporary directory."""
-    key = (
-        f"{repo_name}-{version}{archive_ext}"
-        if is_google_fonts
-        else f"{owner}-{repo_name}-{version}{archive_ext}"
-    )
+    key = _archive_cache_key(owner, repo_name, version, archive_ext, is_google_fonts)
     logger.debug(f"Checking cache for key {key}")
 
     if cache is not None and key in cache:
@@ -310,15 +743,7 @@ def get_or_download_and_extract_archive(
         extract_dir = Path(temp_dir)
 
         with console.status("[bold green]Extracting from cache..."):
-            if archive_ext == ".zip":
-                with zipfile.ZipFile(cached_archive_path, "r") as archive_ref:
-                    safe_members = _get_safe_members(archive_ref, "zip", extract_dir)
-                    archive_ref.extractall(extract_dir, members=safe_members)
-            else:
-                mode = "r:xz" if archive_ext == ".tar.xz" else "r:gz"
-                with tarfile.open(cached_archive_path, mode) as archive_ref:
-                    safe_members = _get_safe_members(archive_ref, "tar", extract_dir)
-                    archive_ref.extractall(extract_dir, members=safe_members)
+            extract_archive(cached_archive_path, archive_ext, extract_dir)
 
         return extract_dir
     else:
@@ -327,41 +752,54 @@ def get_or_download_and_extract_archive(
         temp_dir = tempfile.mkdtemp()
         extract_dir = Path(temp_dir)
 
+        if archive_ext != ".zip":
+            with console.status("[bold green]Downloading and extracting archive..."):
+                _download_and_extract_tar(archive_url, archive_ext, extract_dir, key)
+            logger.info("Archive downloaded and extracted")
+            return extract_dir
+
+        if cache is None:
+            # Zip archives can only be read from a seekable file. With nothing
+            # to keep, a spooled one spares small archives the disk entirely
+            with tempfile.SpooledTemporaryFile(SPOOL_MAX_SIZE) as spool:
+                with console.status("[bold green]Downloading archive..."):
+                    logger.debug(f"Downloading archive from {archive_url}")
+                    _download_file(archive_url, cast("BinaryIO", spool))
+                console.print("Download complete.")
+                spool.seek(0)
+                with console.status("[bold green]Extracting..."):
+                    extract_archive(cast("BinaryIO", spool), archive_ext, extract_dir)
+            logger.info("Archive extracted")
+            return extract_dir
+
+        # When caching, the zip is downloaded next to its cache slot and renamed
+        # into it, not copied
         tmp_file = tempfile.NamedTemporaryFile(
-            dir=temp_dir, suffix=".archive", delete=False
+            dir=CACHE_DIR, suffix=".part", delete=False
         )
         tmp_path = Path(tmp_file.name)
         tmp_file.close()
 
-        with console.status("[bold green]Downloading archive..."):
-            logger.debug(f"Downloading archive from {archive_url}")
-            with httpx.stream("GET", archive_url, follow_redirects=True) as response:
-                response.raise_for_status()
-                with open(tmp_path, "wb") as f:
-                    for chunk in response.iter_bytes():
-                        f.write(chunk)
-
-        console.print("Download complete.")
-        logger.info("Archive downloaded successfully")
-
-        # Copy to cache (diskcache will evict old entries if necessary)
-        if cache is not None:
-            cache_path = CACHE_DIR / f"{key}"
-            shutil.copy(tmp_path, cache_path)
-            cache[key] = str(cache_path)
-            console.print("Archive cached.")
-            logger.debug("Archive cached")
-
-        with console.status("[bold green]Extracting..."):
-            if archive_ext == ".zip":
-                with zipfile.ZipFile(tmp_path, "r") as archive_ref:
-                    safe_members = _get_safe_members(archive_ref, "zip", extract_dir)
-                    archive_ref.extractall(extract_dir, members=safe_members)
-            else:
-                mode = "r:xz" if archive_ext == ".tar.xz" else "r:gz"
-                with tarfile.open(tmp_path, mode) as archive_ref:
-                    safe_members = _get_safe_members(archive_ref, "tar", extract_dir)
-                    archive_ref.extractall(extract_dir, members=safe_members)
+        try:
+            with console.status("[bold green]Downloading archive..."):
+                logger.debug(f"Downloading archive from {archive_url}")
+                _download_file(archive_url, tmp_path)
+
+            console.print("Download complete.")
+            logger.info("Archive downloaded successfully")
+
+            archive_path = tmp_path
+            if _fits_in_cache(tmp_path.stat().st_size):
+                archive_path = CACHE_DIR / key
+                os.replace(tmp_path, archive_path)
+                cache[key] = str(archive_path)  # type: ignore
+                console.print("Archive cached.")
+                logger.debug("Archive cached")
+
+            with console.status("[bold green]Extracting..."):
+                extract_archive(archive_path, archive_ext, extract_dir)
+        finally:
+            tmp_path.unlink(missing_ok=True)
 
         logger.info("Archive extracted")
         return extract_dir
@@ -1,213 +1,260 @@
-from typing import TYPE_CHECKING, List, Tuple
+import hashlib
+import mmap
+import os
+import struct
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
 
-from fontTools.ttLib import TTFont  # pyright: ignore[reportMissingTypeStubs]
 from rich.console import Console
 
+from .config import cache
+from .constants import FONT_EXTENSIONS
+
 if TYPE_CHECKING:
-    from pathlib import Path
+    from .types import CategorizedFonts, FontMeta
 
 console = Console()
 
+SFNT_VERSIONS = (b"\x00\x01\x00\x00", b"OTTO", b"true")
+WOFF_HEADER_SIZE = 44
+# Format priority names of each extension, for variable and static fonts
+PRIORITIES_BY_EXTENSION = {
+    ".ttf": ("variable-ttf", "static-ttf"),
+    ".otf": ("otf", "otf"),
+    ".woff": ("variable-woff", "static-woff"),
+    ".woff2": ("variable-woff2", "static-woff2"),
+}
+# Font metadata reads are short and I/O bound; more threads stop paying off
+MAX_PROBE_WORKERS = 8
+# Files larger than this are memory-mapped for hashing
+MMAP_HASH_THRESHOLD = 1 << 20  # 1MB
+
+
+def _probe_font(font_path: str) -> Optional[FontMeta]:
+    """
+    Read font metadata straight from the table directory of a TrueType/OpenType
+    or WOFF file, only inflating the OS/2 table of the latter.
+
+    Returns None if the file is in another format (WOFF2 tables are compressed
+    as a single stream) or can't be parsed, in which case fontTools should be
+    used instead.
+    """
+    try:
+        with open(font_path, "rb") as f:
+            header = f.read(WOFF_HEADER_SIZE)
+            if len(header) < 12:
+                return None
+            if header[:4] in SFNT_VERSIONS:
+                num_tables = struct.unpack_from(">H", header, 4)[0]
+                f.seek(12)
+                directory = f.read(16 * num_tables)
+                # tag, checksum, offset, length
+                tables = {
+                    tag: (offset, length, length)
+                    for tag, _, offset, length in struct.iter_unpack(
+                        ">4sIII", directory
+                    )
+                }
+            elif header[:4] == b"wOFF" and len(header) == WOFF_HEADER_SIZE:
+                num_tables = struct.unpack_from(">H", header, 12)[0]
+                directory = f.read(20 * num_tables)
+                # tag, offset, compressed length, original length, checksum
+                tables = {
+                    tag: (offset, comp_length, orig_length)
+                    for tag, offset, comp_length, orig_length, _ in struct.iter_unpack(
+                        ">4sIIII", directory
+                    )
+                }
+            else:
+                return None
+            if len(tables) < num_tables:
+                return None
+
+            is_variable = b"fvar" in tables
+            if b"OS/2" not in tables:
+                return 400, False, is_variable  # default to regular
+
+            offset, comp_length, orig_length = tables[b"OS/2"]
+            f.seek(offset)
+            if comp_length < orig_length:
+                os2 = zlib.decompress(f.read(comp_length))
+            else:
+                os2 = f.read(64)
+            if len(os2) < 64:
+                return None
+            # usWeightClass is at offset 4 and fsSelection at offset 62
+            weight, fs_selection = struct.unpack_from(">4xH56xH", os2)
+            return weight, (fs_selection & 0x01) != 0, is_variable
+    except (OSError, struct.error, zlib.error):
+        return None
+
+
+def _read_font_meta(font_path: str) -> FontMeta:
+    """
+    Read the weight class, italic flag and variable flag of a font file.
+    """
+    meta = _probe_font(font_path)
+    if meta is not None:
+        return meta
+
+    # Only WOFF2 and malformed files get here, so fontTools is loaded lazily
+    from fontTools.ttLib import TTFont  # pyright: ignore[reportMissingTypeStubs]
+
+    # Lazily, so only OS/2 is decompiled; closed so hashing isn't blocked on Windows
+    with TTFont(font_path, lazy=True) as font:
+        is_variable = "fvar" in font
+        try:
+            os2_table = font["OS/2"]  # type: ignore
+            weight = os2_table.usWeightClass  # type: ignore
+            italic = (os2_table.fsSelection & 0x01) != 0  # type: ignore
+        except Exception:
+            weight, italic = 400, False  # default to regular
+    return weight, italic, is_variable  # type: ignore
+
+
+# Persisted font metadata expires, so entries of fonts that are never seen
+# again do not pile up in the cache
+FONT_META_TTL = 30 * 24 * 60 * 60  # 30 days
+
+# Files modified after this were written by this run, such as fonts
+# directories and Google Fonts downloads, so their keys never come back
+_RUN_STARTED_NS = time.time_ns()
+
+# In-process copy of the font metadata read during this run
+_font_meta_memo: Dict[Tuple[str, str, int, int], FontMeta] = {}
+
+
+def get_font_meta(font_path: str) -> FontMeta:
+    """
+    Get the weight class, italic flag and variable flag of a font file.
+
+    Results are kept in memory for repeated lookups in a run, and persisted in
+    the download cache when the file keeps the modification time it had in its
+    archive, so that the same file is only parsed once across runs.
+    """
+    # Fonts are extracted to a new temporary directory on every run, so the key
+    # uses the file name rather than its full path. Fonts of the same name from
+    # different releases or repos only share a key if they also have the same
+    # size and archived modification time to the nanosecond, which in practice
+    # means the same build of the same font.
+    stat = os.stat(font_path)
+    key = ("font_meta", os.path.basename(font_path), stat.st_size, stat.st_mtime_ns)
+    if key in _font_meta_memo:
+        return _font_meta_memo[key]
+    persist = cache is not None and stat.st_mtime_ns < _RUN_STARTED_NS
+    if persist:
+        meta = cache.get(key)  # type: ignore
+        if meta is not None:
+            _font_meta_memo[key] = meta  # type: ignore
+            return meta  # type: ignore
+
+    meta = _read_font_meta(font_path)
+    if persist:
+        cache.set(key, meta, expire=FONT_META_TTL)  # type: ignore
+    _font_meta_memo[key] = meta
+    return meta
+
 
-def is_variable_font(font_path: str) -> bool:
+def hash_file(path: Path) -> str:
     """
-    Check if a font file is a variable font.
+    Compute the SHA-256 hex digest of a file without reading it all into memory.
     """
-    font = TTFont(font_path)
-    return "fvar" in font
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size > MMAP_HASH_THRESHOLD:
+            # Hash straight from the page cache, letting the kernel handle
+            # readahead instead of copying chunks into Python bytes
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return hashlib.sha256(mapped).hexdigest()
+        # file_digest hashes in C with its own buffer and releases the GIL
+        return hashlib.file_digest(f, "sha256").hexdigest()
 
 
-def get_font_weight(font_path: str) -> int:
+def list_file_names(directory: Path) -> Set[str]:
     """
-    Get the weight class of a font file.
+    Get the names of the entries of a directory in a single read, rather than
+    checking files one stat at a time. Empty if the directory is missing.
     """
     try:
-        font = TTFont(font_path)
-        os2_table = font["OS/2"]  # type: ignore
-        return os2_table.usWeightClass  # type: ignore
-    except Exception:
-        return 400  # default to regular
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except FileNotFoundError:
+        return set()
 
 
-def get_font_italic(font_path: str) -> bool:
+def find_font_files(directory: Path) -> List[Path]:
     """
-    Check if a font file is italic.
+    Find all font files under a directory in a single traversal, whatever the
+    case of their extension.
     """
+    return [
+        Path(root) / name
+        for root, _, files in os.walk(directory)
+        for name in files
+        if name.lower().endswith(FONT_EXTENSIONS)
+    ]
+
+
+def _probe_meta(font_file: Path) -> FontMeta:
+    """Get the metadata of a font file, treating unreadable files as regular static."""
     try:
-        font = TTFont(font_path)
-        os2_table = font["OS/2"]  # type: ignore
-        return (os2_table.fsSelection & 0x01) != 0  # type: ignore
+        return get_font_meta(str(font_file))
     except Exception:
-        return False
-
-
-def categorize_fonts(
-    font_files: List[Path],
-) -> Tuple[
-    List[Path], List[Path], List[Path], List[Path], List[Path], List[Path], List[Path]
-]:
-    """Categorize font files into variable/static and by type."""
-    ttf_files = [f for f in font_files if f.suffix.lower() == ".ttf"]
-    otf_files = [f for f in font_files if f.suffix.lower() == ".otf"]
-    woff_files = [f for f in font_files if f.suffix.lower() == ".woff"]
-    woff2_files = [f for f in font_files if f.suffix.lower() == ".woff2"]
-
-    variable_ttfs: List[Path] = []
-    static_ttfs: List[Path] = []
-    for ttf in ttf_files:
-        try:
-            if is_variable_font(str(ttf)):
-                variable_ttfs.append(ttf)
-            else:
-                static_ttfs.append(ttf)
-        except Exception:
-            static_ttfs.append(ttf)
+        return 400, False, False
 
-    variable_woffs: List[Path] = []
-    static_woffs: List[Path] = []
-    for woff in woff_files:
-        try:
-            if is_variable_font(str(woff)):
-                variable_woffs.append(woff)
-            else:
-                static_woffs.append(woff)
-        except Exception:
-            static_woffs.append(woff)
 
-    variable_woff2s: List[Path] = []
-    static_woff2s: List[Path] = []
-    for woff2 in woff2_files:
-        try:
-            if is_variable_font(str(woff2)):
-                variable_woff2s.append(woff2)
-            else:
-                static_woff2s.append(woff2)
-        except Exception:
-            static_woff2s.append(woff2)
+def categorize_fonts(font_files: List[Path]) -> CategorizedFonts:
+    """
+    Categorize font files by format priority name, reading the metadata of
+    every file once, in parallel.
+    """
+    metas: Dict[Path, FontMeta] = {}
+    if font_files:
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_PROBE_WORKERS, len(font_files))
+        ) as executor:
+            metas = dict(
+                zip(font_files, executor.map(_probe_meta, font_files), strict=True)
+            )
 
-    return (
-        variable_ttfs,
-        static_ttfs,
-        otf_files,
-        variable_woffs,
-        static_woffs,
-        variable_woff2s,
-        static_woff2s,
-    )
+    buckets: Dict[str, List[Path]] = {}
+    for font_file in font_files:
+        pris = PRIORITIES_BY_EXTENSION.get(font_file.suffix.lower())
+        if pris is None:
+            continue
+        pri = pris[0] if metas[font_file][2] else pris[1]
+        buckets.setdefault(pri, []).append(font_file)
+    return buckets, metas
 
 
 def select_fonts(
-    categorized_fonts: Tuple[List[Path], ...],
+    categorized_fonts: CategorizedFonts,
     priorities: List[str],
     weights: List[int],
     styles: List[str],
 ) -> Tuple[List[Path], str]:
     """Select fonts based on priorities and weights."""
-    (
-        variable_ttfs,
-        static_ttfs,
-        otf_files,
-        variable_woffs,
-        static_woffs,
-        variable_woff2s,
-        static_woff2s,
-    ) = categorized_fonts
-
-    selected_fonts: List[Path] = []
-    selected_pri = ""
+    buckets, metas = categorized_fonts
+    weights_set = frozenset(weights)
+    styles_set = frozenset(styles)
     for pri in priorities:
-        if pri == "variable-woff2" and variable_woff2s:
-            if weights or styles != ["roman", "italic"]:
-                console.print(
-                    "[yellow]Warning: Weights and styles are ignored for variable fonts.[/yellow]"
-                )
-            selected_fonts = variable_woff2s
-            selected_pri = pri
-            break
-        elif pri == "static-woff2" and static_woff2s:
-            candidates = static_woff2s
-            if weights:
-                candidates = [
-                    f for f in candidates if get_font_weight(str(f)) in weights
-                ]
-            if styles != ["roman", "italic"]:
-                candidates = [
-                    f
-                    for f in candidates
-                    if (get_font_italic(str(f)) and "italic" in styles)
-                    or (not get_font_italic(str(f)) and "roman" in styles)
-                ]
-            if candidates:
-                selected_fonts = candidates
-                selected_pri = pri
-                break
-        elif pri == "variable-woff" and variable_woffs:
-            if weights or styles != ["roman", "italic"]:
-                console.print(
-                    "[yellow]Warning: Weights and styles are ignored for variable fonts.[/yellow]"
-                )
-            selected_fonts = variable_woffs
-            selected_pri = pri
-            break
-        elif pri == "static-woff" and static_woffs:
-            candidates = static_woffs
-            if weights:
-                candidates = [
-                    f for f in candidates if get_font_weight(str(f)) in weights
-                ]
-            if styles != ["roman", "italic"]:
-                candidates = [
-                    f
-                    for f in candidates
-                    if (get_font_italic(str(f)) and "italic" in styles)
-                    or (not get_font_italic(str(f)) and "roman" in styles)
-                ]
-            if candidates:
-                selected_fonts = candidates
-                selected_pri = pri
-                break
-        elif pri == "variable-ttf" and variable_ttfs:
+        candidates = buckets.get(pri)
+        if not candidates:
+            continue
+        if pri.startswith("variable-"):
             if weights or styles != ["roman", "italic"]:
                 console.print(
                     "[yellow]Warning: Weights and styles are ignored for variable fonts.[/yellow]"
                 )
-            selected_fonts = variable_ttfs
-            selected_pri = pri
-            break
-        elif pri == "otf" and otf_files:
-            # OTF are static, filter by weights and styles
-            candidates = otf_files
-            if weights:
-                candidates = [
-                    f for f in candidates if get_font_weight(str(f)) in weights
-                ]
-            if styles != ["roman", "italic"]:
-                candidates = [
-                    f
-                    for f in candidates
-                    if (get_font_italic(str(f)) and "italic" in styles)
-                    or (not get_font_italic(str(f)) and "roman" in styles)
-                ]
-            if candidates:
-                selected_fonts = candidates
-                selected_pri = pri
-                break
-        elif pri == "static-ttf" and static_ttfs:
-            candidates = static_ttfs
-            if weights:
-                candidates = [
-                    f for f in candidates if get_font_weight(str(f)) in weights
-                ]
-            if styles != ["roman", "italic"]:
-                candidates = [
-                    f
-                    for f in candidates
-                    if (get_font_italic(str(f)) and "italic" in styles)
-                    or (not get_font_italic(str(f)) and "roman" in styles)
-                ]
-            if candidates:
-                selected_fonts = candidates
-                selected_pri = pri
-                break
-
-    return selected_fonts, selected_pri
+            return candidates, pri
+        candidates = [
+            f
+            for f in candidates
+            if (not weights_set or metas[f][0] in weights_set)
+            and ("italic" if metas[f][1] else "roman") in styles_set
+        ]
+        if candidates:
+            return candidates, pri
+    return [], ""
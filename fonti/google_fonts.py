@@ -1,23 +1,29 @@
 import base64
+import functools
 import logging
+import os
+import re
 import tempfile
 import zipfile
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import httpx
 import typer
-from bs4 import BeautifulSoup
 from rich.console import Console
 
 from .config import CACHE_DIR, cache, default_github_token, default_google_fonts_direct
-from .downloader import fetch_release_info, get_subdirectory_version
+from .downloader import fetch_release_info, get_http_client, get_subdirectory_version
 from .registry import get_repo_from_registry
 
 console = Console()
 logger = logging.getLogger(__name__)
 
+# Minimum score lead for a GitHub link to be picked without asking
+LINK_SCORE_GAP = 3
 
+
+@functools.lru_cache(maxsize=1024)
 def parse_repo(repo_arg: str) -> Tuple[str, str]:
     """Parse owner/repo string into owner and repo_name."""
     try:
@@ -27,6 +33,39 @@ def parse_repo(repo_arg: str) -> Tuple[str, str]:
         raise ValueError(f"Invalid repo format: {repo_arg}. Use owner/repo") from e
 
 
+def _pick_github_link(links: List[str], font_name: str) -> Optional[str]:
+    """
+    Pick the GitHub link most likely to be the font's source repo.
+
+    Links are scored by how much of the font name their repo name shares, with
+    links outside google/fonts preferred. Returns None if no link is a clear
+    winner, in which case the user should be asked.
+    """
+    font_name_normalized = re.sub(r"[^a-z0-9]", "", font_name.lower())
+    scored: List[Tuple[bool, int, str]] = []
+    for link in dict.fromkeys(links):
+        if "github.com/" not in link:
+            continue
+        parts = link.split("github.com/")[1].split("/")
+        if len(parts) < 2 or not parts[1]:
+            continue
+        repo_normalized = re.sub(r"[^a-z0-9]", "", parts[1].lower())
+        score = len(os.path.commonprefix([repo_normalized, font_name_normalized]))
+        is_google_fonts = parts[0].lower() == "google" and parts[1].lower() == "fonts"
+        scored.append((not is_google_fonts, score, link))
+
+    if not scored:
+        return None
+    scored.sort(key=lambda s: (s[0], s[1]), reverse=True)
+    if len(scored) == 1:
+        return scored[0][2]
+    best, runner_up = scored[0], scored[1]
+    if best[0] != runner_up[0] or best[1] - runner_up[1] >= LINK_SCORE_GAP:
+        logger.debug(f"Picked {best[2]} for {font_name} among {len(scored)} links")
+        return best[2]
+    return None
+
+
 def download_subdirectory(font_name: str) -> Tuple[str, str, Path, bool, None]:
     """Download the subdirectory from Google Fonts."""
     headers: Dict[str, str] = {}
@@ -44,7 +83,7 @@ def download_subdirectory(font_name: str) -> Tuple[str, str, Path, bool, None]:
         try:
             api_url = f"https://api.github.com/repos/google/fonts/contents/{dir}/{font_name_lower}"
             logger.debug(f"Fetching contents from {api_url}")
-            response = httpx.get(api_url, headers=headers)
+            response = get_http_client().get(api_url, headers=headers)
             response.raise_for_status()
             contents = response.json()
             font_items = [
@@ -61,7 +100,7 @@ def download_subdirectory(font_name: str) -> Tuple[str, str, Path, bool, None]:
                 headers_blob = headers.copy()
                 headers_blob["Accept"] = "application/vnd.github.raw"
                 logger.debug(f"Downloading blob from {blob_url}")
-                blob_response = httpx.get(blob_url, headers=headers_blob)
+                blob_response = get_http_client().get(blob_url, headers=headers_blob)
                 blob_response.raise_for_status()
                 content = blob_response.content
                 if content.startswith(b"{"):
@@ -147,7 +186,7 @@ def fetch_google_fonts_repo(
                     api_url = (
                         f"https://api.github.com/repos/{owner}/{repo}/contents/{path}"
                     )
-                    response = httpx.get(api_url, headers=headers)
+                    response = get_http_client().get(api_url, headers=headers)
                     response.raise_for_status()
                     contents = response.json()
                     for item in contents:
@@ -193,16 +232,25 @@ def fetch_google_fonts_repo(
     for url in urls:
         try:
             logger.debug(f"Fetching HTML from {url}")
-            response = httpx.get(url, headers=headers, follow_redirects=True)
+            response = get_http_client().get(
+                url, headers=headers, follow_redirects=True
+            )
             response.raise_for_status()
             html_content = response.text
+            from bs4 import BeautifulSoup
+
             soup = BeautifulSoup(html_content, "html.parser")
             links = soup.find_all("a", href=True)
             github_links = [
                 link["href"] for link in links if "github.com" in link["href"]
             ]
             if github_links:
-                if len(github_links) > 1:
+                picked_link = _pick_github_link(
+                    [str(link) for link in github_links], font_name  # type: ignore
+                )
+                if picked_link is not None:
+                    selected_link = picked_link
+                elif len(github_links) > 1:
                     console.print(
                         f"[yellow]Multiple GitHub links found for {font_name}:[/yellow]"
                     )
@@ -235,7 +283,9 @@ def fetch_google_fonts_repo(
                                     path: str, owner: str = owner, repo: str = repo
                                 ) -> bool:
                                     api_url = f"https://api.github.com/repos/{owner}/{repo}/contents/{path}"
-                                    response = httpx.get(api_url, headers=headers)
+                                    response = get_http_client().get(
+                                        api_url, headers=headers
+                                    )
                                     response.raise_for_status()
                                     contents = response.json()
                                     for item in contents:
@@ -1,35 +1,180 @@
+import errno
 import hashlib
 import logging
+import os
 import shutil
-import tarfile
 import tempfile
-import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from pathlib import Path
 from typing import TYPE_CHECKING, Dict, List
 
 import httpx
 from fontTools.ttLib import TTFont  # pyright: ignore[reportMissingTypeStubs]
 from rich.console import Console
+from rich.text import Text
 
 from .config import CACHE_DIR, cache, load_installed_data, save_installed_data
-from .constants import VALID_FORMATS
+from .constants import ARCHIVE_EXTENSIONS, WOFF_PRIORITIES
 from .downloader import (
     download_fonts_dir,
+    extract_archive,
     fetch_release_info,
     get_base_and_ext,
     get_fonts_dir_version,
+    get_http_client,
     get_or_download_and_extract_archive,
     get_subdirectory_version,
     select_archive_asset,
 )
-from .fonts import categorize_fonts, select_fonts
+from .fonts import categorize_fonts, find_font_files, hash_file, select_fonts
 
 if TYPE_CHECKING:
-    from .types import FontEntry
+    from .types import FontEntry, ReleaseInfo
 
 console = Console()
 logger = logging.getLogger(__name__)
 
+# Buffer used when copying a font and hashing it in the same pass
+COPY_BUFFER_SIZE = 1 << 20  # 1MB
+
+
+def _fast_move(src: Path, dst: Path) -> None:
+    """Move a file with a rename, only copying it when crossing filesystems."""
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.copyfile(src, dst)
+        os.unlink(src)
+
+
+def _copy_and_hash(src: Path, dst: Path) -> str:
+    """Copy a file and return its SHA-256 hex digest, reading the data only once."""
+    digest = hashlib.sha256()
+    buffer = bytearray(COPY_BUFFER_SIZE)
+    view = memoryview(buffer)
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        while size := fsrc.readinto(buffer):
+            digest.update(view[:size])
+            fdst.write(view[:size])
+    return digest.hexdigest()
+
+
+def _move_and_hash(src: Path, dst: Path, keep_source: bool) -> str:
+    """
+    Move (or copy, if keep_source) a file and return its SHA-256 hex digest.
+
+    Copies are hashed as they are written. A same-filesystem rename is hashed
+    afterwards, while the data is still in the page cache.
+    """
+    if keep_source:
+        logger.debug(f"Copying {src} to {dst}")
+        return _copy_and_hash(src, dst)
+    logger.debug(f"Moving {src} to {dst}")
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        file_hash = _copy_and_hash(src, dst)
+        os.unlink(src)
+        return file_hash
+    return hash_file(dst)
+
+
+def _matches_entry(path: Path, entry: FontEntry) -> bool:
+    """Check if a file still has the hash of an entry, trusting an unchanged stat."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return False
+    if st.st_size == entry.get("size") and st.st_mtime_ns == entry.get("mtime_ns"):
+        return True
+    return hash_file(path) == entry["hash"]
+
+
+def _move_font(
+    src: Path,
+    dst: Path,
+    compute_hash: bool,
+    keep_source: bool = False,
+    previous_entry: FontEntry | None = None,
+) -> tuple[str | None, bool]:
+    """
+    Move (or copy, if keep_source) a font file, hashing it beforehand if requested.
+
+    If the file has the hash of previous_entry and so does the installed copy,
+    nothing is written. Returns the hash and whether the file was written.
+    """
+    if previous_entry is not None and previous_entry.get("size") not in (
+        None,
+        src.stat().st_size,
+    ):
+        previous_entry = None  # a different size cannot be the same file
+    if compute_hash and previous_entry is None:
+        # Nothing to compare against, so hash during the move itself
+        return _move_and_hash(src, dst, keep_source), True
+
+    file_hash = hash_file(src) if compute_hash else None
+    if (
+        file_hash is not None
+        and previous_entry is not None
+        and file_hash == previous_entry["hash"]
+        and _matches_entry(dst, previous_entry)
+    ):
+        logger.debug(f"{dst.name} is unchanged, skipping")
+        return file_hash, False
+    if keep_source:
+        logger.debug(f"Copying {src} to {dst}")
+        shutil.copyfile(src, dst)
+    else:
+        logger.debug(f"Moving {src} to {dst}")
+        _fast_move(src, dst)
+    return file_hash, True
+
+
+def _remove_stale_fonts(
+    dest_dir: Path, previous_entries: Dict[str, FontEntry], keep: Dict[str, str]
+) -> None:
+    """Delete previously installed fonts that are not part of the new install."""
+    for filename in previous_entries:
+        if filename in keep:
+            continue
+        try:
+            (dest_dir / filename).unlink(missing_ok=True)
+            logger.debug(f"Removed old font: {filename}")
+        except Exception as e:
+            console.print(f"[red]Could not delete {filename}: {e}[/red]")
+
+
+def _get_fonts_dir(owner: str, repo_name: str, version: str) -> tuple[Path, bool]:
+    """
+    Get the fonts directory of a repository at a given version.
+
+    The downloaded tree is kept as-is in the cache directory, so a cache hit
+    needs no unpacking. Returns the directory and whether it belongs to the
+    cache (and must therefore be left untouched).
+    """
+    cache_key = f"{owner}-{repo_name}-fonts-{version.replace(':', '-')}"
+    if cache is not None and cache_key in cache:
+        cached_dir = Path(str(cache[cache_key]))  # type: ignore
+        if cached_dir.is_dir():
+            console.print(f"Using cached fonts directory: {cache_key}")
+            return cached_dir, True
+
+    fonts_dir = download_fonts_dir(owner, repo_name)
+    if cache is None:
+        return fonts_dir, False
+
+    cached_dir = CACHE_DIR / cache_key
+    shutil.rmtree(cached_dir, ignore_errors=True)
+    shutil.move(fonts_dir, cached_dir)
+    cache[cache_key] = str(cached_dir)
+    console.print("Fonts directory cached.")
+    return cached_dir, True
+
 
 def install_fonts(
     selected_fonts: List[Path],
@@ -40,68 +185,119 @@ def install_fonts(
     version: str,
     selected_pri: str,
     local: bool,
+    installed_data: Dict[str, Dict[str, FontEntry]] | None = None,
+    keep_source: bool = False,
 ) -> None:
-    """Install selected fonts to destination directory and update installed data."""
+    """
+    Install selected fonts to destination directory and update installed data.
+
+    If installed_data is given, it is updated in place and saving it is left to
+    the caller; otherwise it is loaded and saved here. Fonts previously installed
+    from the repo are replaced: unchanged files are left in place and files no
+    longer part of the install are deleted. With keep_source, fonts are copied
+    rather than moved out of their directory.
+    """
     logger.info(f"Installing {len(selected_fonts)} fonts to {dest_dir}")
+    owns_installed_data = installed_data is None
+    previous_entries: Dict[str, FontEntry] = {}
+    if not local:
+        if installed_data is None:
+            installed_data = load_installed_data()
+        previous_entries = installed_data.get(repo_key, {})
+
     if not selected_fonts:
         console.print(
             f"[yellow]No font files found in the archive for {owner}/{repo_name}.[/yellow]"
         )
         logger.warning(f"No fonts found for {owner}/{repo_name}")
+        if not local and installed_data is not None and repo_key in installed_data:
+            _remove_stale_fonts(dest_dir, previous_entries, {})
+            del installed_data[repo_key]
+            if owns_installed_data:
+                save_installed_data(installed_data)
         return
 
+    # Per-font warnings, printed together once the install is done
+    warnings: List[str] = []
     with console.status("[bold green]Moving fonts..."):
         valid_fonts: List[Path] = []
         for font_file in selected_fonts:
             try:
-                TTFont(font_file)
+                # Opening validates the table directory; nothing is decompiled
+                with TTFont(font_file, lazy=True):
+                    pass
                 valid_fonts.append(font_file)
                 logger.debug(f"Validated font: {font_file.name}")
             except Exception as e:
                 if not font_file.name.startswith("._"):
-                    console.print(
-                        f"[yellow]Skipping invalid font file {font_file.name}: {e}[/yellow]"
-                    )
+                    warnings.append(f"Skipping invalid font file {font_file.name}: {e}")
                 continue
 
     logger.info(f"Validated {len(valid_fonts)} out of {len(selected_fonts)} fonts")
 
-    for font_file in valid_fonts:
-        dest_path = dest_dir / font_file.name
-        logger.debug(f"Moving {font_file} to {dest_path}")
-        shutil.move(str(font_file), str(dest_path))
+    # Hash each font while it is still warm in the extraction directory, then
+    # move it unless the installed copy is identical; hashlib releases the GIL
+    # so this runs in parallel. Fonts sharing a name (say hinted/ and
+    # unhinted/ copies) would race for one destination, so the last one wins
+    # as it did when fonts were moved one after another.
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        move_futures = {}
+        for font_file in {f.name: f for f in valid_fonts}.values():
+            move_futures[font_file] = executor.submit(
+                _move_font,
+                font_file,
+                dest_dir / font_file.name,
+                not local,
+                keep_source,
+                previous_entries.get(font_file.name),
+            )
 
-    number_installed_fonts = len(valid_fonts)
+    moved_fonts: List[Path] = []
+    file_hashes: Dict[str, str] = {}
+    unchanged_count = 0
+    for font_file, move_future in move_futures.items():
+        try:
+            file_hash, written = move_future.result()
+        except Exception as e:
+            warnings.append(f"Warning: Could not install {font_file.name}: {e}")
+            continue
+        moved_fonts.append(font_file)
+        if not written:
+            unchanged_count += 1
+        if file_hash is not None:
+            file_hashes[font_file.name] = file_hash
 
-    if not local:
-        installed_data = load_installed_data()
-        if repo_key not in installed_data:
-            installed_data[repo_key] = {}
-        previous_count = len(installed_data[repo_key])
-        for font_file in valid_fonts:
-            try:
-                file_hash = hashlib.sha256(
-                    (dest_dir / font_file.name).read_bytes()
-                ).hexdigest()
-                entry: FontEntry = {
-                    "hash": file_hash,
-                    "type": selected_pri,
-                    "version": version,
-                    "owner": owner,
-                    "repo_name": repo_name,
-                }
-                installed_data[repo_key][font_file.name] = entry
-                logger.debug(f"Added to installed data: {font_file.name}")
-            except Exception as e:
-                console.print(
-                    f"[yellow]Warning: Could not hash {font_file.name}: {e}[/yellow]"
-                )
-        save_installed_data(installed_data)
-        number_installed_fonts = len(installed_data[repo_key]) - previous_count
+    number_installed_fonts = len(moved_fonts) - unchanged_count
 
+    if not local and installed_data is not None:
+        _remove_stale_fonts(dest_dir, previous_entries, file_hashes)
+        repo_entries: Dict[str, FontEntry] = {}
+        for filename, file_hash in file_hashes.items():
+            st = (dest_dir / filename).stat()
+            repo_entries[filename] = {
+                "hash": file_hash,
+                "type": selected_pri,
+                "version": version,
+                "owner": owner,
+                "repo_name": repo_name,
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+            }
+            logger.debug(f"Added to installed data: {filename}")
+        if repo_entries:
+            installed_data[repo_key] = repo_entries
+        else:
+            installed_data.pop(repo_key, None)
+        if owns_installed_data:
+            save_installed_data(installed_data)
+
+    if warnings:
+        console.print(Text("\n".join(warnings), style="yellow"), highlight=False)
+
+    unchanged_note = f" ({unchanged_count} unchanged)" if unchanged_count else ""
     console.print(
         f"[green]Moved {number_installed_fonts} font{'' if number_installed_fonts == 1 else 's'} from "
-        f"{owner}/{repo_name} to: {dest_dir}[/green]"
+        f"{owner}/{repo_name} to: {dest_dir}{unchanged_note}[/green]"
     )
     logger.info(
         f"Successfully installed {number_installed_fonts} fonts from {owner}/{repo_name}"
@@ -111,7 +307,7 @@ def install_fonts(
     if not local:
         from .platform_utils import register_fonts
 
-        installed_paths = [dest_dir / f.name for f in valid_fonts]
+        installed_paths = [dest_dir / f.name for f in moved_fonts]
         register_fonts(installed_paths)
 
 
@@ -130,6 +326,8 @@ def install_single_repo(
     pre_extract_dir: Path | None = None,
     is_subdirectory: bool = False,
     source: str | None = None,
+    preresolved_release: ReleaseInfo | None = None,
+    installed_data: Dict[str, Dict[str, FontEntry]] | None = None,
 ) -> None:
     """
     Install fonts from a single GitHub repository.
@@ -143,20 +341,17 @@ def install_single_repo(
         local: Whether to install locally (not globally)
         force: Whether to force reinstall
         keep_multiple: Whether to allow multiple font types
+        preresolved_release: Release info already fetched by the caller, used
+            instead of fetching it again
+        installed_data: Installed fonts data owned by the caller, updated in
+            place without being saved
     """
     repo_arg = f"{owner}/{repo_name}"
     console.print(f"[bold]Installing from {repo_arg}...[/bold]")
     logger.info(f"Starting installation of {repo_arg}")
 
     # Warn for WOFF/WOFF2 global install
-    if (
-        any(
-            p in ["static-woff", "static-woff2", "variable-woff", "variable-woff2"]
-            for p in priorities
-        )
-        and not local
-        and not force
-    ):
+    if not WOFF_PRIORITIES.isdisjoint(priorities) and not local and not force:
         console.print(
             "[yellow]Installing WOFF/WOFF2 fonts globally is not recommended. "
             "Use --force to proceed.[/yellow]"
@@ -165,10 +360,15 @@ def install_single_repo(
         return
 
     extract_dir = None
+    extract_dir_is_cached = False
+    # Temporary directories to remove once the install is over, however it ends
+    cleanup = ExitStack()
     try:
         if is_subdirectory:
             # For subdirectory, extract_dir is already provided
             extract_dir = pre_extract_dir
+            if extract_dir is not None:
+                cleanup.callback(shutil.rmtree, extract_dir, ignore_errors=True)
             version = get_subdirectory_version(repo_name)
         elif release == "latest" and source == "r":
             # Download font files from root
@@ -179,7 +379,7 @@ def install_single_repo(
                 headers["Authorization"] = f"Bearer {default_github_token}"
             api_url = f"https://api.github.com/repos/{owner}/{repo_name}/contents/"
             logger.debug(f"Fetching contents from root {api_url}")
-            response = httpx.get(api_url, headers=headers)  # type: ignore
+            response = get_http_client().get(api_url, headers=headers)  # type: ignore
             response.raise_for_status()
             contents = response.json()
             font_items = [
@@ -193,13 +393,13 @@ def install_single_repo(
                     f"[red]No font files found in root of {owner}/{repo_name}[/red]"
                 )
                 raise ValueError("No font files in root")
-            temp_dir = Path(tempfile.mkdtemp())
+            temp_dir = Path(cleanup.enter_context(tempfile.TemporaryDirectory()))
             for item in font_items:
                 blob_url = item["url"]
                 headers_blob = headers.copy()
                 headers_blob["Accept"] = "application/vnd.github.raw"
                 logger.debug(f"Downloading blob from {blob_url}")
-                blob_response = httpx.get(blob_url, headers=headers_blob)  # type: ignore
+                blob_response = get_http_client().get(blob_url, headers=headers_blob)  # type: ignore
                 blob_response.raise_for_status()
                 content = blob_response.content
                 if content.startswith(b"{"):
@@ -220,26 +420,11 @@ def install_single_repo(
         elif release == "latest" and source == "f":
             try:
                 version = get_fonts_dir_version(owner, repo_name)
-                cache_key = f"{owner}-{repo_name}-fonts-{version.replace(':', '-')}.zip"
-                if cache is not None and cache_key in cache:
-                    console.print(f"Using cached fonts directory: {cache_key}")
-                    cached_zip = str(cache[cache_key])  # type: ignore
-                    extract_dir = Path(tempfile.mkdtemp())
-                    with zipfile.ZipFile(cached_zip, "r") as zip_ref:
-                        zip_ref.extractall(extract_dir)
-                else:
-                    extract_dir = download_fonts_dir(owner, repo_name)
-                    if cache is not None:
-                        zip_path = CACHE_DIR / cache_key
-                        with zipfile.ZipFile(zip_path, "w") as zip_ref:
-                            for file_path in extract_dir.rglob("*"):
-                                if file_path.is_file():
-                                    zip_ref.write(
-                                        file_path,
-                                        file_path.relative_to(extract_dir),
-                                    )
-                        cache[cache_key] = str(zip_path)
-                        console.print("Fonts directory cached.")
+                extract_dir, extract_dir_is_cached = _get_fonts_dir(
+                    owner, repo_name, version
+                )
+                if not extract_dir_is_cached:
+                    cleanup.callback(shutil.rmtree, extract_dir, ignore_errors=True)
                 is_subdirectory = True
                 final_owner = owner
                 final_repo_name = repo_name
@@ -250,8 +435,8 @@ def install_single_repo(
                 raise
         elif release == "latest":
             try:
-                version, assets, _, final_owner, final_repo_name = fetch_release_info(
-                    owner, repo_name, release
+                version, assets, _, final_owner, final_repo_name = (
+                    preresolved_release or fetch_release_info(owner, repo_name, release)
                 )
                 owner = final_owner
                 repo_name = final_repo_name
@@ -269,34 +454,19 @@ def install_single_repo(
                     archive_name,
                     is_google_fonts,
                 )
+                cleanup.callback(shutil.rmtree, extract_dir, ignore_errors=True)
             except httpx.HTTPStatusError as e:
                 if e.response.status_code == 404 and owner != "thegooglefontsrepo":
                     # Fallback to fonts directory
                     try:
                         version = get_fonts_dir_version(owner, repo_name)
-                        cache_key = (
-                            f"{owner}-{repo_name}-fonts-{version.replace(':', '-')}.zip"
+                        extract_dir, extract_dir_is_cached = _get_fonts_dir(
+                            owner, repo_name, version
                         )
-                        if cache is not None and cache_key in cache:
-                            console.print(f"Using cached fonts directory: {cache_key}")
-                            cached_zip = str(cache[cache_key])  # type: ignore
-                            extract_dir = Path(tempfile.mkdtemp())
-                            with zipfile.ZipFile(cached_zip, "r") as zip_ref:
-                                zip_ref.extractall(extract_dir)
-                        else:
-                            extract_dir = download_fonts_dir(owner, repo_name)
-                            # Cache
-                            if cache is not None:
-                                zip_path = CACHE_DIR / cache_key
-                                with zipfile.ZipFile(zip_path, "w") as zip_ref:
-                                    for file_path in extract_dir.rglob("*"):
-                                        if file_path.is_file():
-                                            zip_ref.write(
-                                                file_path,
-                                                file_path.relative_to(extract_dir),
-                                            )
-                                cache[cache_key] = str(zip_path)
-                                console.print("Fonts directory cached.")
+                        if not extract_dir_is_cached:
+                            cleanup.callback(
+                                shutil.rmtree, extract_dir, ignore_errors=True
+                            )
                         is_subdirectory = True
                         final_owner = owner
                         final_repo_name = repo_name
@@ -311,32 +481,23 @@ def install_single_repo(
             version = release
             cached_key = None
             archive_ext = None
-            for ext in VALID_FORMATS:  # Wait, no, ARCHIVE_EXTENSIONS
-                from .constants import ARCHIVE_EXTENSIONS
-
+            if cache is not None:
                 for ext in ARCHIVE_EXTENSIONS:
                     key = f"{owner}-{repo_name}-{version}{ext}"
-                    if cache is not None and key in cache:
+                    if key in cache:
                         cached_key = key
                         archive_ext = ext
                         break
             if cached_key:
                 console.print(f"Using cached archive: {cached_key}")
                 cached_archive_path = str(cache[cached_key])  # type: ignore
-                temp_dir = tempfile.mkdtemp()
-                extract_dir = Path(temp_dir)
+                extract_dir = Path(cleanup.enter_context(tempfile.TemporaryDirectory()))
 
                 with console.status("[bold green]Extracting from cache..."):
-                    if archive_ext == ".zip":
-                        with zipfile.ZipFile(cached_archive_path, "r") as archive_ref:
-                            archive_ref.extractall(extract_dir)
-                    else:
-                        mode = "r:xz" if archive_ext == ".tar.xz" else "r:gz"
-                        with tarfile.open(cached_archive_path, mode) as archive_ref:
-                            archive_ref.extractall(extract_dir)
+                    extract_archive(cached_archive_path, archive_ext, extract_dir)
             else:
-                _, assets, _, final_owner, final_repo_name = fetch_release_info(
-                    owner, repo_name, release
+                _, assets, _, final_owner, final_repo_name = (
+                    preresolved_release or fetch_release_info(owner, repo_name, release)
                 )
                 owner = final_owner
                 repo_name = final_repo_name
@@ -354,15 +515,11 @@ def install_single_repo(
                     archive_name,
                     is_google_fonts,
                 )
+                cleanup.callback(shutil.rmtree, extract_dir, ignore_errors=True)
 
         # Find all font files
         assert extract_dir is not None
-        font_files = (
-            list(extract_dir.rglob("*.ttf"))
-            + list(extract_dir.rglob("*.otf"))
-            + list(extract_dir.rglob("*.woff"))
-            + list(extract_dir.rglob("*.woff2"))
-        )
+        font_files = find_font_files(extract_dir)
 
         categorized_fonts = categorize_fonts(font_files)
         selected_fonts, selected_pri = select_fonts(
@@ -370,13 +527,15 @@ def install_single_repo(
         )
         logger.info(f"Selected {len(selected_fonts)} fonts matching criteria")
 
+        owns_installed_data = installed_data is None
         if not local:
-            installed_data = load_installed_data()
+            if installed_data is None:
+                installed_data = load_installed_data()
             if repo_key in installed_data:
                 current_versions = {
                     f["version"] for f in installed_data[repo_key].values()
                 }
-                if len(current_versions) == 1 and list(current_versions)[0] == version:
+                if current_versions == {version}:
                     if not force:
                         console.print(
                             f"[yellow]{repo_key} version {version} is already installed. "
@@ -391,19 +550,8 @@ def install_single_repo(
                             f"[yellow]Forcing reinstall of {repo_key} version {version}...[/yellow]"
                         )
                         logger.info(f"Forcing reinstall of {repo_key}")
-                # Remove old fonts
-                for filename in installed_data[repo_key]:
-                    font_path = dest_dir / filename
-                    if font_path.exists():
-                        try:
-                            font_path.unlink()
-                            logger.debug(f"Removed old font: {filename}")
-                        except Exception as e:
-                            console.print(
-                                f"[red]Could not delete {filename}: {e}[/red]"
-                            )
-                del installed_data[repo_key]
-                save_installed_data(installed_data)
+                # Old fonts are replaced by install_fonts, which keeps the
+                # unchanged ones in place
 
         install_fonts(
             selected_fonts,
@@ -414,12 +562,15 @@ def install_single_repo(
             version,
             selected_pri,
             local,
+            installed_data,
+            keep_source=extract_dir_is_cached,
         )
+        if owns_installed_data and installed_data is not None:
+            save_installed_data(installed_data)
 
     except Exception as e:
         console.print(f"[red]Error installing from {repo_arg}: {e}[/red]")
         logger.error(f"Installation failed for {repo_arg}: {e}")
         raise
     finally:
-        if extract_dir:
-            shutil.rmtree(str(extract_dir))
+        cleanup.close()
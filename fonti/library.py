@@ -1,11 +1,11 @@
-import hashlib
-import json
 import logging
+import os
 import shutil
-from collections import defaultdict
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 from pathlib import Path
-from typing import TYPE_CHECKING, Callable, Dict, List, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 
 import typer
 from fontTools.ttLib import TTFont  # pyright: ignore[reportMissingTypeStubs]
@@ -13,23 +13,41 @@ from rich.console import Console
 
 from .config import (
     INSTALLED_FILE,
+    cache,
     default_path,
     default_priorities,
+    json_dumps,
+    json_loads,
     load_installed_data,
     save_installed_data,
 )
-from .fonts import is_variable_font
+from .constants import ARCHIVE_EXTENSIONS
+from .downloader import GITHUB_WORKERS, fetch_release_info
+from .fonts import hash_file, list_file_names
 from .google_fonts import parse_repo
 from .installer import install_single_repo
 
 if TYPE_CHECKING:
-    from .types import ExportedFontEntry
+    from concurrent.futures import Future
+
+    from .types import ExportedFontEntry, FontEntry, ReleaseInfo
 
 console = Console()
 logger = logging.getLogger(__name__)
 
+# File extension each installed font type must have
+EXTENSION_BY_TYPE = {
+    "variable-ttf": ".ttf",
+    "static-ttf": ".ttf",
+    "otf": ".otf",
+    "variable-woff": ".woff",
+    "static-woff": ".woff",
+    "variable-woff2": ".woff2",
+    "static-woff2": ".woff2",
+}
+
 
-def export_fonts(output: str, stdout: bool) -> None:
+def export_fonts(output: str, stdout: bool, pretty: bool = False) -> None:
     """
     Export the installed font library to a shareable file.
     """
@@ -54,13 +72,14 @@ def export_fonts(output: str, stdout: bool) -> None:
                 exported_entry["repo_name"] = entry["repo_name"]
             exported[repo][filename] = exported_entry
 
+    payload = json_dumps(exported, indent=pretty)
     if stdout:
-        console.print(json.dumps(exported, indent=2))
+        sys.stdout.buffer.write(payload + b"\n")
+        sys.stdout.flush()
     else:
         try:
             logger.debug(f"Writing exported data to {output}")
-            with open(output, "w") as f:
-                json.dump(exported, f, indent=2)
+            Path(output).write_bytes(payload)
             console.print(f"[green]Exported to {output}[/green]")
         except Exception as e:
             console.print(f"[red]Error writing to {output}: {e}[/red]")
@@ -74,47 +93,132 @@ def import_fonts(file: str, force: bool, local: bool) -> None:
     logger.info(f"Importing fonts from {file}")
     try:
         logger.debug(f"Loading exported data from {file}")
-        with open(file) as f:
-            exported: Dict[str, Dict[str, ExportedFontEntry]] = json.load(f)
+        exported: Dict[str, Dict[str, ExportedFontEntry]] = json_loads(
+            Path(file).read_bytes()
+        )
     except Exception as e:
         console.print(f"[red]Error loading {file}: {e}[/red]")
         raise typer.Exit(1) from e
 
+    sources: List[Tuple[str, str, str, str, List[str]]] = []
     for repo, fonts in exported.items():
-        if not fonts:
-            continue
-
-        # Get unique types
-        types = list({entry.get("type", "static-ttf") for entry in fonts.values()})
-        # Assume all have same version
-        version = list(fonts.values())[0].get("version", "latest")
-        first_entry = list(fonts.values())[0]
-        if "owner" in first_entry:
-            owner = first_entry["owner"]
-            repo_name = repo
-        else:
-            # Old format, repo is owner/name
-            try:
-                owner, repo_name = repo.split("/")
-            except ValueError:
-                console.print(f"[red]Invalid repo format in import: {repo}[/red]")
-                continue
-        # Set priorities to the first type
-        priorities = [types[0]] if types else []
-
-        install_single_repo(
-            owner,
-            repo_name,
-            repo,
-            version,
-            priorities,
-            Path.cwd() if local else default_path,
-            local,
-            force,
-            [],
-            ["roman", "italic"],
+        source = _import_source(repo, fonts)
+        if source is not None:
+            sources.append(source)
+
+    # Look up all releases concurrently; installs then run one at a time
+    with (
+        console.status("[bold green]Fetching release info..."),
+        ThreadPoolExecutor(max_workers=GITHUB_WORKERS) as executor,
+    ):
+        releases = list(
+            executor.map(lambda src: _lookup_import_release(*src[1:4]), sources)
         )
 
+    installed_data = None if local else load_installed_data()
+    try:
+        for (repo, owner, repo_name, version, priorities), release_info in zip(
+            sources, releases, strict=True
+        ):
+            install_single_repo(
+                owner,
+                repo_name,
+                repo,
+                version,
+                priorities,
+                Path.cwd() if local else default_path,
+                local,
+                force,
+                [],
+                ["roman", "italic"],
+                preresolved_release=release_info,
+                installed_data=installed_data,
+            )
+    finally:
+        if installed_data is not None:
+            save_installed_data(installed_data)
+
+
+def _import_source(
+    repo: str, fonts: Dict[str, ExportedFontEntry]
+) -> Optional[Tuple[str, str, str, str, List[str]]]:
+    """
+    Get the repo key, owner, repo name, version and priorities to install an
+    exported repo with, or None if it cannot be imported.
+    """
+    if not fonts:
+        return None
+
+    # Assume all have same version
+    first_entry = next(iter(fonts.values()))
+    version = first_entry.get("version", "latest")
+    if "owner" in first_entry:
+        owner = first_entry["owner"]
+        repo_name = repo
+    else:
+        # Old format, repo is owner/name
+        try:
+            owner, repo_name = repo.split("/")
+        except ValueError:
+            console.print(f"[red]Invalid repo format in import: {repo}[/red]")
+            return None
+    # Set priorities to the type of the first font
+    priorities = [first_entry.get("type", "static-ttf")]
+    return repo, owner, repo_name, version, priorities
+
+
+def _lookup_import_release(
+    owner: str, repo_name: str, version: str
+) -> ReleaseInfo | None:
+    """
+    Fetch release info ahead of an install, or None to leave it to the install.
+
+    Pinned versions whose archive is cached are installed from the cache
+    without their release, so they are not looked up. Runs without a status
+    spinner so that it can run in a worker thread.
+    """
+    if version != "latest" and cache is not None:
+        keys = (f"{owner}-{repo_name}-{version}{ext}" for ext in ARCHIVE_EXTENSIONS)
+        if any(key in cache for key in keys):
+            return None
+    try:
+        return fetch_release_info(owner, repo_name, version, quiet=True)
+    except Exception as e:
+        logger.debug(f"Could not prefetch release of {owner}/{repo_name}: {e}")
+        return None
+
+
+def _check_installed_font(
+    file_path: Path, entry: FontEntry
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Validate an installed font file against its entry.
+
+    Returns why its repo needs reinstalling, if it does, and otherwise the
+    current hash of the file. A file whose size and mtime still match the entry
+    is taken to be unchanged without being read.
+    """
+    try:
+        st = file_path.stat()
+    except OSError:
+        return "unreadable file(s)", None
+    if st.st_size == entry.get("size") and st.st_mtime_ns == entry.get("mtime_ns"):
+        return None, entry["hash"]
+    try:
+        # Opening the font validates its table directory, which already tells
+        # whether it is variable
+        with TTFont(str(file_path), lazy=True) as font:
+            is_var = "fvar" in font
+        expected_var = entry["type"].startswith("variable-")
+    except Exception:
+        return "invalid font file(s)", None
+    if expected_var != is_var:
+        return "variable/static mismatch", None
+    try:
+        return None, hash_file(file_path)
+    except Exception:
+        return "unreadable file(s)", None
+
 
 def fix_fonts(backup: bool, granular: bool) -> None:
     """
@@ -151,25 +255,24 @@ def fix_fonts(backup: bool, granular: bool) -> None:
             return 1
         return 0
 
-    def del_duplicate(repo: str, filename: str) -> int:
-        if repo in installed_data and filename in installed_data[repo]:
-            del installed_data[repo][filename]
-            # If repo now empty, remove it
-            if not installed_data[repo]:
-                del installed_data[repo]
-                console.print(f"[green]Removed empty repo {repo}[/green]")
-            return 1
-        return 0
-
     def update_hash(repo: str, filename: str, new_hash: str) -> int:
         if repo in installed_data and filename in installed_data[repo]:
-            installed_data[repo][filename]["hash"] = new_hash
+            entry = installed_data[repo][filename]
+            entry["hash"] = new_hash
+            # Remember the new stat so the next fix doesn't rehash the file
+            try:
+                st = (default_path / filename).stat()
+                entry["size"] = st.st_size
+                entry["mtime_ns"] = st.st_mtime_ns
+            except OSError:
+                entry.pop("size", None)
+                entry.pop("mtime_ns", None)
             return 1
         return 0
 
     def reinstall_repo(repo: str) -> int:
         try:
-            first_entry = list(installed_data[repo].values())[0]
+            first_entry = next(iter(installed_data[repo].values()))
             owner = first_entry["owner"]
             repo_name = first_entry["repo_name"]
             install_single_repo(
@@ -183,6 +286,7 @@ def fix_fonts(backup: bool, granular: bool) -> None:
                 True,
                 [],
                 ["roman", "italic"],
+                installed_data=installed_data,
             )
             return 1
         except Exception as e:
@@ -190,114 +294,75 @@ def fix_fonts(backup: bool, granular: bool) -> None:
             return 0
 
     actions: List[Tuple[str, Callable[[], int]]] = []
-    invalid_repos: List[str] = []
-    invalid_entries: List[Tuple[str, str]] = []
+    mismatch_actions: List[Tuple[str, Callable[[], int]]] = []
     repos_to_reinstall: Dict[str, str] = {}
-
-    # Detect invalid repos
-    invalid_repos = []
-    for repo in installed_data.keys():
-        if "/" in repo:
-            try:
-                parse_repo(repo)
-            except ValueError:
-                invalid_repos.append(repo)
-                actions.append(
-                    (f"Remove invalid repo: {repo}", partial(del_repo, repo))
-                )
-
-    # Detect type/extension mismatches
-    type_to_ext = {
-        "variable-ttf": ".ttf",
-        "static-ttf": ".ttf",
-        "otf": ".otf",
-        "variable-woff": ".woff",
-        "static-woff": ".woff",
-        "variable-woff2": ".woff2",
-        "static-woff2": ".woff2",
-    }
-    invalid_entries = []
-    for repo, fonts in installed_data.items():
-        if repo in invalid_repos:
-            continue  # Will be removed anyway
-        for filename, entry in fonts.items():
-            expected_ext = type_to_ext.get(entry["type"])
-            if expected_ext and not filename.endswith(expected_ext):
-                invalid_entries.append((repo, filename))
-                actions.append(
-                    (
-                        f"Remove invalid entry: {repo}/{filename} (type/extension mismatch)",
-                        partial(del_entry, repo, filename),
+    # Repos listing each filename; the first one keeps the file
+    filename_to_repos: Dict[str, List[str]] = {}
+
+    # Walk the entries once, detecting invalid repos, type/extension mismatches
+    # and duplicates, and validating each installed file in parallel. The
+    # checks' results are handled in order afterwards
+    installed_files = list_file_names(default_path)
+    checks: List[
+        Tuple[str, str, Future[Tuple[Optional[str], Optional[str]]] | None]
+    ] = []
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for repo, fonts in installed_data.items():
+            if "/" in repo:
+                try:
+                    parse_repo(repo)
+                except ValueError:
+                    actions.append(
+                        (f"Remove invalid repo: {repo}", partial(del_repo, repo))
                     )
-                )
-
-    # Detect duplicates: filename -> list of repos
-    filename_to_repos: Dict[str, List[str]] = defaultdict(list)
-    for repo, fonts in installed_data.items():
-        if repo in invalid_repos:
-            continue
-        for filename in fonts.keys():
-            if (repo, filename) not in invalid_entries:
-                filename_to_repos[filename].append(repo)
+                    continue  # Will be removed anyway
+            for filename, entry in fonts.items():
+                expected_ext = EXTENSION_BY_TYPE.get(entry["type"])
+                if expected_ext and not filename.endswith(expected_ext):
+                    mismatch_actions.append(
+                        (
+                            f"Remove invalid entry: {repo}/{filename} (type/extension mismatch)",
+                            partial(del_entry, repo, filename),
+                        )
+                    )
+                    continue
+                repos = filename_to_repos.setdefault(filename, [])
+                repos.append(repo)
+                if len(repos) > 1:
+                    continue  # A duplicate to be removed
+                future = None
+                if filename in installed_files:
+                    future = executor.submit(
+                        _check_installed_font, default_path / filename, entry
+                    )
+                checks.append((repo, filename, future))
 
-    duplicates = {
-        filename: repos
-        for filename, repos in filename_to_repos.items()
-        if len(repos) > 1
-    }
+    actions.extend(mismatch_actions)
 
     # Collect actions for duplicates
-    for filename, repos in duplicates.items():
+    for filename, repos in filename_to_repos.items():
         for repo in repos[1:]:
             actions.append(
                 (
                     f"Remove duplicate {filename} from {repo}",
-                    partial(del_duplicate, repo, filename),
+                    partial(del_entry, repo, filename),
                 )
             )
 
-    # Detect file issues
-    for repo, fonts in installed_data.items():
-        if repo in invalid_repos:
+    for repo, filename, future in checks:
+        if future is None:
+            repos_to_reinstall[repo] = "missing file(s)"
             continue
-        for filename, entry in fonts.items():
-            if (repo, filename) in invalid_entries:
-                continue
-            # Check if it's a duplicate to be removed
-            is_duplicate_to_remove = any(
-                repo == r and filename == f
-                for f, repos in duplicates.items()
-                for r in repos[1:]
+        reason, current_hash = future.result()
+        if reason is not None:
+            repos_to_reinstall[repo] = reason
+        elif current_hash != installed_data[repo][filename]["hash"]:
+            actions.append(
+                (
+                    f"Update hash for modified file: {repo}/{filename}",
+                    partial(update_hash, repo, filename, current_hash),
+                )
             )
-            if is_duplicate_to_remove:
-                continue
-            file_path = default_path / filename
-            if not file_path.exists():
-                repos_to_reinstall[repo] = "missing file(s)"
-            else:
-                # Validate font
-                try:
-                    TTFont(str(file_path))
-                    is_var = is_variable_font(str(file_path))
-                    expected_var = entry["type"].startswith("variable-")
-                    if expected_var != is_var:
-                        repos_to_reinstall[repo] = "variable/static mismatch"
-                        continue
-                except Exception:
-                    repos_to_reinstall[repo] = "invalid font file(s)"
-                    continue
-                # If valid, check hash
-                try:
-                    current_hash = hashlib.sha256(file_path.read_bytes()).hexdigest()
-                    if current_hash != entry["hash"]:
-                        actions.append(
-                            (
-                                f"Update hash for modified file: {repo}/{filename}",
-                                partial(update_hash, repo, filename, current_hash),
-                            )
-                        )
-                except Exception:
-                    repos_to_reinstall[repo] = "unreadable file(s)"
 
     for repo, reason in sorted(repos_to_reinstall.items()):
         actions.append(
@@ -323,8 +388,7 @@ def fix_fonts(backup: bool, granular: bool) -> None:
                 console.print(f"[green]{replaced_message}[/green]")
     else:
         console.print(f"[yellow]Found {len(actions)} issue(s):[/yellow]")
-        for message, _ in actions:
-            console.print(f"  {message}")
+        console.print("\n".join(f"  {message}" for message, _ in actions))
 
         if not typer.confirm("Proceed with fixes?", default=True):
             console.print("[blue]Aborted.[/blue]")
@@ -354,13 +418,15 @@ def list_fonts() -> None:
         console.print("[yellow]No installed fonts found.[/yellow]")
         return
 
+    # Printed in one go, a separate write per line is slow for large libraries
+    lines: List[str] = []
     for repo in sorted(data.keys()):
         fonts = data[repo]
         if not fonts:
             continue
 
         # Get owner and repo_name from first entry
-        first_entry = list(fonts.values())[0]
+        first_entry = next(iter(fonts.values()))
         owner = first_entry.get("owner", "")
         repo_name = first_entry.get("repo_name", repo)
 
@@ -370,14 +436,15 @@ def list_fonts() -> None:
         else:
             link = f"https://github.com/{owner}/{repo_name}"
 
-        console.print(f"[bold blue]Family: {repo}[/bold blue]")
-        console.print(f"[link={link}]Source: {link}[/link]")
-        console.print("Files:")
+        lines.append(f"[bold blue]Family: {repo}[/bold blue]")
+        lines.append(f"[link={link}]Source: {link}[/link]")
+        lines.append("Files:")
 
         for filename in sorted(fonts.keys()):
             entry = fonts[filename]
             file_type = entry["type"]
             version = entry["version"]
-            console.print(f"  - {filename}: {file_type}, {version}")
+            lines.append(f"  - {filename}: {file_type}, {version}")
 
-        console.print()  # Empty line between families
+        lines.append("")  # Empty line between families
+    console.print("\n".join(lines))
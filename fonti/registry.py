@@ -4,7 +4,6 @@ import time
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 
-from git import Repo
 from rich.console import Console
 
 from .config import cache, default_registry_check_interval
@@ -62,6 +61,8 @@ def clone_registry() -> None:
     logger.info("Cloning registry repository")
     REGISTRY_DIR.mkdir(parents=True, exist_ok=True)
     logger.debug(f"Cloning registry from {REGISTRY_REPO_URL} to {REGISTRY_DIR}")
+    from git import Repo
+
     repo = Repo.clone_from(REGISTRY_REPO_URL, REGISTRY_DIR, depth=1, no_checkout=True)
     repo.git.sparse_checkout("set", "--no-cone", "registry/fonti_registry.json")
     repo.git.checkout()
@@ -76,9 +77,6 @@ def update_registry(force: bool = False) -> None:
         clone_registry()
         return
 
-    repo = Repo(REGISTRY_DIR)
-    current_commit = repo.head.commit.hexsha
-
     # Check if we need to update
     now = time.time()
     last_check = 0.0
@@ -97,6 +95,12 @@ def update_registry(force: bool = False) -> None:
         logger.debug("Registry check interval not passed")
         return  # No need to check yet
 
+    # GitPython is slow to import, so only load it once a check is due
+    from git import Repo
+
+    repo = Repo(REGISTRY_DIR)
+    current_commit = repo.head.commit.hexsha
+
     # Check if commit changed
     if current_commit == last_commit:
         console.print("[green]Registry is up to date.[/green]")
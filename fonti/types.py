@@ -1,4 +1,5 @@
-from typing import TypedDict
+from pathlib import Path
+from typing import Dict, List, NotRequired, Tuple, TypedDict
 
 
 class Asset(TypedDict):
@@ -13,6 +14,9 @@ class FontEntry(TypedDict):
     version: str
     owner: str
     repo_name: str
+    # Stat of the installed file when it was hashed, to skip rehashing it
+    size: NotRequired[int]
+    mtime_ns: NotRequired[int]
 
 
 class ExportedFontEntry(TypedDict, total=False):
@@ -20,3 +24,13 @@ class ExportedFontEntry(TypedDict, total=False):
     version: str
     owner: str
     repo_name: str
+
+
+# (version, assets, body, final owner, final repo name) of a GitHub release
+ReleaseInfo = Tuple[str, List[Asset], str, str, str]
+
+# (weight class, italic, variable) of a font file
+FontMeta = Tuple[int, bool, bool]
+
+# Font files by format priority name, and the metadata of each file
+CategorizedFonts = Tuple[Dict[str, List[Path]], Dict[Path, FontMeta]]
@@ -1,12 +1,17 @@
-import hashlib
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING, Dict, List
 
 from rich.console import Console
+from rich.text import Text
 
 from .config import default_path, load_installed_data, save_installed_data
+from .fonts import hash_file, list_file_names
 
 if TYPE_CHECKING:
+    from concurrent.futures import Future
+
     from .types import FontEntry
 
 console = Console()
@@ -26,6 +31,8 @@ def uninstall_fonts(repo: List[str], force: bool) -> None:
     dest_dir = default_path
     deleted_count = 0
     deleted_paths: List[str] = []
+    # Per-font warnings, printed together once all repos are processed
+    warnings: List[str] = []
 
     for repo_arg in repo:
         if "/" in repo_arg:
@@ -39,7 +46,8 @@ def uninstall_fonts(repo: List[str], force: bool) -> None:
                 console.print(f"[yellow]No fonts installed from {repo_arg}.[/yellow]")
                 continue
             fonts = installed_data[repo_key]
-            if not fonts or list(fonts.values())[0]["owner"].lower() != owner.lower():
+            first = next(iter(fonts.values()), None)
+            if first is None or first["owner"].lower() != owner.lower():
                 console.print(f"[yellow]No fonts installed from {repo_arg}.[/yellow]")
                 continue
         else:
@@ -49,39 +57,58 @@ def uninstall_fonts(repo: List[str], force: bool) -> None:
                 continue
             fonts = installed_data[repo_key]
 
+        existing = fonts.keys() & list_file_names(dest_dir)
+
+        # Hash in parallel; hashlib releases the GIL while digesting. With
+        # --force every file is deleted regardless, so skip hashing entirely
+        hash_futures: Dict[str, Future[str]] = {}
+        if not force:
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                hash_futures = {
+                    filename: executor.submit(hash_file, dest_dir / filename)
+                    for filename in existing
+                }
+
         remaining: Dict[str, FontEntry] = {}
+        deleted_messages: List[str] = []
         for filename, entry in fonts.items():
             font_path = dest_dir / filename
 
-            if not font_path.exists():
-                console.print(
-                    f"[yellow]Font {filename} not found in {dest_dir}.[/yellow]"
-                )
+            if filename not in existing:
+                warnings.append(f"Font {filename} not found in {dest_dir}.")
                 remaining[filename] = entry
                 continue
 
-            try:
-                current_hash = hashlib.sha256(font_path.read_bytes()).hexdigest()
-            except Exception as e:
-                console.print(f"[yellow]Could not hash {filename}: {e}[/yellow]")
-                remaining[filename] = entry
-                continue
+            if force:
+                should_delete = True
+            else:
+                try:
+                    current_hash = hash_futures[filename].result()
+                except Exception as e:
+                    warnings.append(f"Could not hash {filename}: {e}")
+                    remaining[filename] = entry
+                    continue
+                should_delete = current_hash == entry["hash"]
 
-            if current_hash == entry["hash"] or force:
+            if should_delete:
                 try:
                     font_path.unlink()
-                    console.print(f"[green]Deleted {filename} from {repo_arg}.[/green]")
+                    deleted_messages.append(f"Deleted {filename} from {repo_arg}.")
                     deleted_count += 1
                     deleted_paths.append(str(font_path))
                 except Exception as e:
                     console.print(f"[red]Could not delete {filename}: {e}[/red]")
                     remaining[filename] = entry
             else:
-                console.print(
-                    f"[yellow]Font {filename} has been modified. Use --force to delete.[/yellow]"
+                warnings.append(
+                    f"Font {filename} has been modified. Use --force to delete."
                 )
                 remaining[filename] = entry
 
+        if deleted_messages:
+            console.print(
+                Text("\n".join(deleted_messages), style="green"), highlight=False
+            )
         if remaining:
             installed_data[repo_key] = remaining
         else:
@@ -89,6 +116,9 @@ def uninstall_fonts(repo: List[str], force: bool) -> None:
 
     save_installed_data(installed_data)
 
+    if warnings:
+        console.print(Text("\n".join(warnings), style="yellow"), highlight=False)
+
     if deleted_count > 0:
         console.print(
             f"[green]Uninstalled {deleted_count} font{'' if deleted_count == 1 else 's'}.[/green]"
@@ -1,11 +1,14 @@
 import logging
-from typing import TYPE_CHECKING, List, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import suppress
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
-from packaging.version import Version
+from packaging.version import InvalidVersion, Version
 from rich.console import Console
+from rich.text import Text
 
 if TYPE_CHECKING:
-    from pathlib import Path
+    from .types import FontEntry, ReleaseInfo
 
 from .config import (
     default_path,
@@ -13,16 +16,79 @@ from .config import (
     load_installed_data,
     save_installed_data,
 )
-from .downloader import fetch_release_info, get_fonts_dir_version
+from .downloader import (
+    GITHUB_WORKERS,
+    LATEST_RELEASE_MAX_AGE,
+    fetch_release_info,
+    get_fonts_dir_version,
+)
+from .fonts import list_file_names
 from .installer import install_single_repo
 
 console = Console()
 logger = logging.getLogger(__name__)
 
+# Parsed versions keyed by their cleaned string; many repos share the same tags
+_parsed_versions: Dict[str, Optional[Version]] = {}
+
+
+def _parse_version(version: str) -> Optional[Version]:
+    """Parse a cleaned version string, returning None if it isn't PEP 440."""
+    if version not in _parsed_versions:
+        try:
+            _parsed_versions[version] = Version(version)
+        except InvalidVersion:
+            _parsed_versions[version] = None
+    return _parsed_versions[version]
+
+
+def _is_newer(latest_version: str, installed_version: str) -> bool:
+    """Check whether the latest version is newer than the installed one."""
+    # Strip 'v' if present
+    latest_clean = latest_version.lstrip("v")
+    installed_clean = installed_version.lstrip("v")
+    if latest_clean == installed_clean:
+        return False
+
+    v_latest = _parse_version(latest_clean)
+    v_installed = _parse_version(installed_clean)
+    if v_latest is None or v_installed is None:
+        # Fallback to string comparison for dates
+        return latest_clean > installed_clean
+    return v_latest > v_installed
+
+
+def _fetch_latest(
+    owner: str, repo_name: str, max_age: float
+) -> Tuple[str, str, str, str, Optional[ReleaseInfo]]:
+    """
+    Get the latest version, changelog, final owner and final repo name of a
+    repository, and its release info if it has releases.
+
+    Repositories without releases fall back to the date of their fonts
+    directory. Runs without a status spinner so that it can run in a worker
+    thread. A cached release younger than max_age seconds is trusted as is.
+    """
+    try:
+        release_info = fetch_release_info(
+            owner, repo_name, "latest", quiet=True, max_age=max_age
+        )
+    except Exception:
+        if owner != "thegooglefontsrepo":
+            with suppress(Exception):
+                latest_version = get_fonts_dir_version(owner, repo_name)
+                return latest_version, "", owner, repo_name, None
+        raise
+    latest_version, _, body, final_owner, final_repo_name = release_info
+    return latest_version, body, final_owner, final_repo_name, release_info
+
 
-def update_fonts(repo: List[str], changelog: bool) -> None:
+def update_fonts(repo: List[str], changelog: bool, refresh: bool = False) -> None:
     """
     Update installed fonts to the latest versions.
+
+    Latest releases looked up within the last day are reused from the cache
+    unless refresh is set.
     """
     logger.info("Updating installed fonts")
     installed_data = load_installed_data()
@@ -31,7 +97,9 @@ def update_fonts(repo: List[str], changelog: bool) -> None:
         return
 
     updated_count = 0
-    repos_to_update: List[Tuple[str, str, str, str, str, List[str], str]] = []
+    repos_to_update: List[
+        Tuple[str, str, str, str, str, List[str], str, Optional[ReleaseInfo]]
+    ] = []
 
     repos_to_check: List[str] = []
     if not repo:
@@ -45,7 +113,7 @@ def update_fonts(repo: List[str], changelog: bool) -> None:
                     for key in installed_data:
                         fonts = installed_data[key]
                         if fonts:
-                            entry = list(fonts.values())[0]
+                            entry = next(iter(fonts.values()))
                             if (
                                 entry["owner"] == owner_input
                                 and entry["repo_name"] == name_input
@@ -64,142 +132,131 @@ def update_fonts(repo: List[str], changelog: bool) -> None:
                 else:
                     console.print(f"[yellow]No fonts installed from {r}.[/yellow]")
 
-    for repo_name in repos_to_check:
-        if repo_name not in installed_data:
-            continue
-
-        fonts = installed_data[repo_name]
-        if not fonts:
-            continue
-
-        # Assume all have same version
-        installed_version = list(fonts.values())[0]["version"]
-        owner = list(fonts.values())[0]["owner"]
-        repo_name_actual = list(fonts.values())[0]["repo_name"]
+    # Look up the latest release of every repo concurrently; results are then
+    # handled in order
+    max_age = 0 if refresh else LATEST_RELEASE_MAX_AGE
+    checks: List[
+        Tuple[
+            str,
+            Dict[str, FontEntry],
+            FontEntry,
+            Future[Tuple[str, str, str, str, Optional[ReleaseInfo]]],
+        ]
+    ] = []
+    with (
+        console.status("[bold green]Checking for updates..."),
+        ThreadPoolExecutor(max_workers=GITHUB_WORKERS) as executor,
+    ):
+        for repo_name in repos_to_check:
+            fonts = installed_data.get(repo_name)
+            if not fonts:
+                continue
+            # Assume all have same version
+            first = next(iter(fonts.values()))
+            future = executor.submit(
+                _fetch_latest, first["owner"], first["repo_name"], max_age
+            )
+            checks.append((repo_name, fonts, first, future))
 
+    for repo_name, fonts, first, future in checks:
+        installed_version = first["version"]
+        owner = first["owner"]
         try:
-            latest_version, _, body, final_owner, final_repo_name = fetch_release_info(
-                owner, repo_name_actual, "latest"
+            latest_version, body, final_owner, final_repo_name, release_info = (
+                future.result()
             )
         except Exception as e:
-            if owner == "thegooglefontsrepo":
-                console.print(
-                    f"[yellow]Could not fetch latest for {owner}/{repo_name}: {e}[/yellow]"
-                )
-                continue
-            else:
-                # Try fonts dir
-                try:
-                    latest_version = get_fonts_dir_version(owner, repo_name_actual)
-                    final_owner = owner
-                    final_repo_name = repo_name_actual
-                    body = ""
-                except Exception:
-                    console.print(
-                        f"[yellow]Could not fetch latest for {owner}/{repo_name}: {e}[/yellow]"
-                    )
-                    continue
-
-        # Strip 'v' if present
-        def clean_version(v: str) -> str:
-            return v.lstrip("v")
+            console.print(
+                f"[yellow]Could not fetch latest for {owner}/{repo_name}: {e}[/yellow]"
+            )
+            continue
 
-        try:
-            v_latest = Version(clean_version(latest_version))
-            v_installed = Version(clean_version(installed_version))
-            if v_latest > v_installed:
-                repos_to_update.append(
-                    (
-                        repo_name,
-                        installed_version,
-                        latest_version,
-                        final_owner,
-                        final_repo_name,
-                        list(fonts.keys()),
-                        body,
-                    )
-                )
-        except Exception:
-            # Fallback to string comparison for dates
-            if clean_version(latest_version) > clean_version(installed_version):
-                repos_to_update.append(
-                    (
-                        repo_name,
-                        installed_version,
-                        latest_version,
-                        final_owner,
-                        final_repo_name,
-                        list(fonts.keys()),
-                        body,
-                    )
+        if _is_newer(latest_version, installed_version):
+            repos_to_update.append(
+                (
+                    repo_name,
+                    installed_version,
+                    latest_version,
+                    final_owner,
+                    final_repo_name,
+                    list(fonts.keys()),
+                    body,
+                    release_info,
                 )
+            )
 
-    for (
-        repo_name,
-        installed_version,
-        latest_version,
-        owner,
-        _repo_name,
-        fonts,
-        body,
-    ) in repos_to_update:
-        console.print(
-            f"[bold]Updating {owner}/{_repo_name} from {installed_version} to {latest_version}...[/bold]"
-        )
-        # Uninstall old
-        dest_dir = default_path
-        old_paths: List[Path] = []
-        for filename in fonts:
-            font_path = dest_dir / filename
-            if font_path.exists():
-                old_paths.append(font_path)
-        # Unregister old fonts
-        if old_paths:
-            from .platform_utils import unregister_fonts
-
-            unregister_fonts(old_paths)
-        # Delete old files
-        for filename in fonts:
-            font_path = dest_dir / filename
-            if font_path.exists():
-                try:
-                    logger.debug(f"Removing old font file {font_path}")
-                    font_path.unlink()
-                except Exception as e:
-                    console.print(f"[red]Could not delete {filename}: {e}[/red]")
-        # Remove from data
-        del installed_data[repo_name]
-        # Save
-        save_installed_data(installed_data)
-        # Install new
-        install_single_repo(
+    # Save once all repos are updated, or as far as it got if one fails
+    try:
+        for (
+            repo_name,
+            installed_version,
+            latest_version,
             owner,
             _repo_name,
-            repo_name,
-            "latest",
-            default_priorities,
-            default_path,
-            False,
-            True,
-            [],
-            ["roman", "italic"],
-        )
-        if changelog and body:
+            fonts,
+            body,
+            release_info,
+        ) in repos_to_update:
             console.print(
-                f"[bold]Changelog for {owner}/{repo_name} {latest_version}:[/bold]"
+                f"[bold]Updating {owner}/{_repo_name} from {installed_version} to {latest_version}...[/bold]"
+            )
+            # Uninstall old
+            dest_dir = default_path
+            existing = list_file_names(dest_dir)
+            old_paths = [
+                dest_dir / filename for filename in fonts if filename in existing
+            ]
+            # Unregister old fonts
+            if old_paths:
+                from .platform_utils import unregister_fonts
+
+                unregister_fonts(old_paths)
+            # Delete old files
+            for font_path in old_paths:
+                try:
+                    logger.debug(f"Removing old font file {font_path}")
+                    font_path.unlink(missing_ok=True)
+                except Exception as e:
+                    console.print(f"[red]Could not delete {font_path.name}: {e}[/red]")
+            # Remove from data
+            del installed_data[repo_name]
+            # Install new
+            install_single_repo(
+                owner,
+                _repo_name,
+                repo_name,
+                "latest",
+                default_priorities,
+                default_path,
+                False,
+                True,
+                [],
+                ["roman", "italic"],
+                preresolved_release=release_info,
+                installed_data=installed_data,
             )
-            console.print(body)
-        updated_count += 1
+            if changelog and body:
+                console.print(
+                    f"[bold]Changelog for {owner}/{repo_name} {latest_version}:[/bold]"
+                )
+                console.print(body)
+            updated_count += 1
+    finally:
+        if repos_to_update:
+            save_installed_data(installed_data)
 
+    up_to_date: List[str] = []
+    updating = {r[0] for r in repos_to_update}
     for repo_name in repos_to_check:
-        if repo_name in installed_data and repo_name not in [
-            r[0] for r in repos_to_update
-        ]:
+        if repo_name in installed_data and repo_name not in updating:
             fonts = installed_data[repo_name]
             if fonts:
-                installed_version = list(fonts.values())[0]["version"]
-                owner = list(fonts.values())[0]["owner"]
-                repo_name_actual = list(fonts.values())[0]["repo_name"]
-                console.print(
-                    f"[dim]{owner}/{repo_name_actual} is up to date ({installed_version}).[/dim]"
+                first = next(iter(fonts.values()))
+                installed_version = first["version"]
+                owner = first["owner"]
+                repo_name_actual = first["repo_name"]
+                up_to_date.append(
+                    f"{owner}/{repo_name_actual} is up to date ({installed_version})."
                 )
+    if up_to_date:
+        console.print(Text("\n".join(up_to_date), style="dim"), highlight=False)